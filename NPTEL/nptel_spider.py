@@ -4,227 +4,490 @@ NPTEL Course Downloader - Simplified Version
 Downloads complete NPTEL course playlists from YouTube
 """
 
+import argparse
+import asyncio
+import functools
+import importlib.util
+import json
 import os
+import queue
 import re
+import shutil
 import sys
+import threading
 import time
-import yt_dlp
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+
+# Check for required package without importing it; yt_dlp itself is only
+# imported once a playlist is actually fetched or downloaded
+if importlib.util.find_spec('yt_dlp') is None:
+    print("❌ Required package 'yt-dlp' not found!")
+    print("📦 Install it using: pip install yt-dlp")
+    print("\nRun this command:")
+    print("   pip install yt-dlp")
+    sys.exit(1)
+
+CACHE_MAX_AGE = 24 * 60 * 60  # Seconds before a cached playlist listing is refetched
+LECTURE_OUTTMPL = 'Lecture_%(playlist_index)03d - %(title).200B.%(ext)s'  # Relative to the course folder
+ARCHIVE_FILENAME = '.yt-dlp-archive.txt'  # yt-dlp download archive, one per course folder
+PLAYLIST_URL = 'https://www.youtube.com/playlist?list={}'  # Canonical form handed to yt-dlp
+REDRAW_INTERVAL = 0.1  # Seconds between progress board redraws
+COURSE_TAG_LEN = 20  # Characters of the course name shown on each board line
+_PLAYLIST_RE = re.compile(r'(?:youtube\.com/.*[?&]list=|youtu\.be/.*[?&]list=)([A-Za-z0-9_-]+)')
+_INVALID_FILENAME_CHARS = str.maketrans('', '', '<>:"/\\|?*')
+
+# Brotli shrinks YouTube's JSON metadata well below gzip, but yt-dlp can only
+# decode it when a brotli module is installed
+HAS_BROTLI = any(importlib.util.find_spec(m) for m in ('brotli', 'brotlicffi'))
+METADATA_HEADERS = {'Accept-Encoding': 'gzip, br' if HAS_BROTLI else 'gzip'}
+
+@functools.lru_cache(maxsize=None)
+def parse_playlist_id(url: str):
+    """Validate a YouTube playlist URL and return its playlist ID (None if invalid)"""
+    m = _PLAYLIST_RE.search(url)
+    return m.group(1) if m else None
+
+@functools.lru_cache(maxsize=None)
+def get_lecture_number_pp():
+    """Build the LectureNumberPP class on first use, so yt_dlp loads lazily"""
+    from yt_dlp.postprocessor import PostProcessor
+    
+    class LectureNumberPP(PostProcessor):
+        """Stamp each video with its lecture number before it is downloaded
+        
+        Videos are downloaded from their own URLs rather than through the playlist,
+        so yt-dlp doesn't know their position; this fills in `playlist_index` so
+        the output template can use it.
+        """
+        
+        def __init__(self, lecture_nums: dict, on_start=None):
+            super().__init__()
+            self.lecture_nums = lecture_nums  # video URL -> lecture number
+            self.on_start = on_start
+        
+        def run(self, info):
+            lecture_num = self.lecture_nums.get(info.get('original_url')) or self.lecture_nums.get(info.get('webpage_url'))
+            if lecture_num:
+                info['playlist_index'] = lecture_num
+                if self.on_start:
+                    self.on_start(lecture_num, info.get('title') or '')
+            return [], info
+    
+    return LectureNumberPP
+
+@dataclass(slots=True)
+class Videos:
+    """Playlist entries as parallel lists; position k of each list is one video
+    
+    Unavailable videos keep their place (so lecture numbering holds) with a
+    url of None.
+    """
+    indices: list = field(default_factory=list)  # Lecture numbers (1-based playlist position)
+    ids: list = field(default_factory=list)
+    titles: list = field(default_factory=list)
+    urls: list = field(default_factory=list)
+    
+    def __len__(self):
+        return len(self.indices)
 
 class NPTELDownloader:
-    def __init__(self):
+    def __init__(self, concurrency: int = 4, refresh: bool = False, auto_confirm: bool = False):
         self.base_download_path = "NPTEL_Courses"
+        self.cache_path = os.path.join(self.base_download_path, ".cache")
+        self.refresh = refresh  # Ignore cached playlist listings
+        self.auto_confirm = auto_confirm  # Start downloading without asking
+        self.concurrency = concurrency  # Parallel downloads (keep low to avoid throttling)
+        
+        # Worker threads report progress through this queue; a single printer
+        # thread owns stdout while downloads run
+        self._progress_q = queue.Queue()
+        self._draw_board = sys.stdout.isatty()  # Only redraw in place on a real terminal
+        self._cancel = threading.Event()  # Set on Ctrl-C so running downloads abort
+        threading.Thread(target=self._printer_loop, daemon=True).start()
+        
+        # One YoutubeDL for playlist metadata; reusing it keeps yt-dlp's
+        # connections and cookies warm
+        self._ydl = None  # Created on first listing
+        self._ydl_lock = threading.Lock()  # Playlists may be listed from several threads
         
+        # Open the connection to YouTube while the user is still typing a URL
+        threading.Thread(target=self._warmup, daemon=True).start()
+        
+    def say(self, text: str):
+        """Print a line through the printer thread so it cannot tear the status board"""
+        self._progress_q.put_nowait(('message', text))
+    
     def sanitize_filename(self, filename: str) -> str:
         """Remove invalid characters from filename"""
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            filename = filename.replace(char, '')
-        return filename.strip()[:200]
+        return filename.translate(_INVALID_FILENAME_CHARS).strip()[:200]
     
-    def extract_playlist_info(self, url: str):
-        """Extract basic playlist information"""
-        print("\n📋 Fetching playlist information...")
-        
-        ydl_opts = {
-            'quiet': True,
-            'extract_flat': True,
-            'force_generic_extractor': False,
-        }
-        
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            try:
-                info = ydl.extract_info(url, download=False)
-                playlist_title = info.get('title', 'NPTEL_Course')
-                total_videos = len(info.get('entries', []))
-                uploader = info.get('uploader', 'Unknown')
-                
-                print(f"✅ Playlist: {playlist_title}")
-                print(f"📺 Channel: {uploader}")
-                print(f"📊 Total Videos: {total_videos}")
-                
-                return playlist_title, total_videos
-                
-            except Exception as e:
-                print(f"❌ Error accessing playlist: {e}")
-                return None, 0
+    def load_cached_playlist(self, playlist_id: str):
+        """Load a playlist listing cached less than CACHE_MAX_AGE ago"""
+        path = os.path.join(self.cache_path, f"{playlist_id}.json")
+        try:
+            if time.time() - os.path.getmtime(path) > CACHE_MAX_AGE:
+                return None
+            with open(path, encoding="utf-8") as f:
+                cached = json.load(f)
+            return cached['meta'], Videos(**cached['videos'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+    
+    def save_cached_playlist(self, playlist_id: str, playlist_meta: dict, videos: Videos):
+        """Cache a playlist listing so re-runs skip the extraction"""
+        path = os.path.join(self.cache_path, f"{playlist_id}.json")
+        try:
+            os.makedirs(self.cache_path, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({'meta': playlist_meta, 'videos': asdict(videos)}, f)
+        except OSError as e:
+            self.say(f"⚠️  Could not cache playlist listing: {e}")
+    
+    def print_playlist_info(self, playlist_meta: dict):
+        """Display the playlist banner"""
+        self.say(f"✅ Playlist: {playlist_meta['title']}")
+        self.say(f"📺 Channel: {playlist_meta['uploader']}")
+        self.say(f"📊 Total Videos: {playlist_meta['total']}")
     
-    def get_all_video_urls(self, playlist_url: str):
-        """Get all video URLs from the playlist"""
-        print("\n🔍 Fetching all video links from playlist...")
-        print("⏳ This may take a moment for large playlists...")
+    def get_all_video_urls(self, playlist_id: str):
+        """Get playlist information and all video URLs in a single extraction
         
-        ydl_opts = {
-            'quiet': True,
-            'extract_flat': False,  # Get full info for each video
-            'ignoreerrors': True,   # Continue even if some videos are unavailable
-        }
+        Returns (playlist_meta, videos); playlist_meta is None if the playlist
+        could not be accessed.
+        """
+        if not self.refresh:
+            cached = self.load_cached_playlist(playlist_id)
+            if cached:
+                self.say("\n💾 Using cached playlist listing (run with --refresh to refetch)")
+                self.print_playlist_info(cached[0])
+                return cached
         
-        videos = []
+        self.say("\n🔍 Fetching playlist information and video links...")
         
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            try:
-                print("   Starting to fetch video information...")
-                playlist_info = ydl.extract_info(playlist_url, download=False)
-                
-                if 'entries' not in playlist_info:
-                    print("❌ No videos found in playlist!")
-                    return []
-                
-                entries = playlist_info['entries']
-                total = len(entries)
-                
-                print(f"   Found {total} videos. Processing...")
-                
-                for i, entry in enumerate(entries, 1):
-                    # Show progress every 5 videos
-                    if i % 5 == 0 or i == 1 or i == total:
-                        print(f"   📊 Processing video {i}/{total}... ({i*100//total}%)")
-                    
-                    if entry:  # Check if entry is not None
-                        video_info = {
-                            'title': entry.get('title', f'Video_{i}'),
-                            'url': entry.get('webpage_url', entry.get('url', '')),
-                            'duration': entry.get('duration', 0),
-                            'index': i
-                        }
-                        videos.append(video_info)
-                    else:
-                        print(f"   ⚠️  Video {i} is unavailable or private")
-                        # Still add a placeholder to maintain numbering
-                        videos.append({
-                            'title': f'Unavailable_Video_{i}',
-                            'url': None,
-                            'duration': 0,
-                            'index': i
-                        })
-                
-                print(f"\n✅ Successfully fetched {len([v for v in videos if v['url']])} available videos")
-                
-                return videos
-                
-            except Exception as e:
-                print(f"❌ Error fetching playlist: {e}")
-                return []
-    
-    def download_video(self, video_info: dict, output_path: str) -> bool:
-        """Download a single video"""
-        if not video_info['url']:
-            print(f"   ⚠️  Skipping unavailable video: {video_info['title']}")
-            return False
+        videos = Videos()
         
-        # Create filename with lecture number
-        lecture_num = video_info['index']
-        clean_title = self.sanitize_filename(video_info['title'])
-        filename = f"Lecture_{lecture_num:03d} - {clean_title}"
+        try:
+            with self._ydl_lock:
+                self._ensure_ydl()
+                self._ydl.params.update({
+                    'extract_flat': 'in_playlist',  # Titles and URLs only, no per-video page fetch
+                    'ignoreerrors': True,   # Continue even if some videos are unavailable
+                    'force_generic_extractor': False,
+                })
+                playlist_info = self._ydl.extract_info(PLAYLIST_URL.format(playlist_id), download=False)
+            
+            entries = playlist_info.get('entries') or []
+            # Prefer the count YouTube reports over sizing the entry list
+            total = playlist_info.get('playlist_count') or playlist_info.get('n_entries') or len(entries)
+            playlist_meta = {
+                'title': playlist_info.get('title', 'NPTEL_Course'),
+                'uploader': playlist_info.get('uploader', 'Unknown'),
+                'total': total,
+            }
+            
+            self.print_playlist_info(playlist_meta)
+            
+            if not entries:
+                return playlist_meta, videos
+            
+            available_count = 0
+            for i, entry in enumerate(entries, 1):
+                videos.indices.append(i)
+                if entry:  # Check if entry is not None
+                    url = entry.get('url')
+                    videos.ids.append(entry.get('id'))
+                    videos.titles.append(entry.get('title') or f'Video_{i}')
+                    videos.urls.append(url)
+                    if url:
+                        available_count += 1
+                else:
+                    # Still add a placeholder to maintain numbering
+                    videos.ids.append(None)
+                    videos.titles.append(f'Unavailable_Video_{i}')
+                    videos.urls.append(None)
+            
+            self.say(f"\n✅ Successfully fetched {available_count} available videos")
+            
+            self.save_cached_playlist(playlist_id, playlist_meta, videos)
+            
+            return playlist_meta, videos
+            
+        except Exception as e:
+            self.say(f"❌ Error accessing playlist: {e}")
+            return None, Videos()
+    
+    def _ensure_ydl(self):
+        """Create the shared YoutubeDL if needed (caller holds _ydl_lock)"""
+        if self._ydl is None:
+            import yt_dlp  # Deferred: loading yt-dlp's extractors is slow
+            self._ydl = yt_dlp.YoutubeDL({
+                'quiet': True,
+                'no_warnings': True,
+                'http_headers': METADATA_HEADERS,
+            })
+    
+    def _warmup(self):
+        """Load yt-dlp and complete the TLS handshake with YouTube ahead of time"""
+        try:
+            with self._ydl_lock:
+                self._ensure_ydl()
+                self._ydl.urlopen('https://www.youtube.com/generate_204').read()
+        except Exception:
+            pass  # Purely an optimisation; the real request will report any problem
+    
+    def close(self):
+        """Close the shared YoutubeDL instance"""
+        if self._ydl is not None:
+            self._ydl.close()
+    
+    def load_archive(self, output_path: str) -> set:
+        """Read the IDs recorded in a course folder's download archive"""
+        try:
+            with open(os.path.join(output_path, ARCHIVE_FILENAME), encoding="utf-8") as f:
+                return {line.split()[1] for line in f if line.startswith('youtube ') and len(line.split()) == 2}
+        except OSError:
+            return set()
+    
+    def download_batch(self, batch: list, output_path: str) -> int:
+        """Download (lecture_num, url) pairs through one YoutubeDL, returning how many succeeded"""
+        lecture_nums = {url: lecture_num for lecture_num, url in batch}
+        course = os.path.basename(output_path)  # Keeps lectures of parallel playlists apart
+        finished = []
         
         ydl_opts = {
             'format': 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best',
             'merge_output_format': 'mp4',
-            'outtmpl': os.path.join(output_path, f'{filename}.%(ext)s'),
+            # playlist_index is filled in with the lecture number by LectureNumberPP
+            'paths': {'home': output_path},
+            'outtmpl': LECTURE_OUTTMPL,
             'quiet': True,
             'no_warnings': True,
-            'progress_hooks': [lambda d: self.progress_hook(d, lecture_num)],
+            'ignoreerrors': True,  # One broken lecture shouldn't abort the rest of the batch
+            # Record finished lectures so re-runs skip them without any network request
+            'download_archive': os.path.join(output_path, ARCHIVE_FILENAME),
+            'continuedl': True,  # Resume partially downloaded .part files
+            'nooverwrites': True,
+            'progress_hooks': [lambda d: self.progress_hook(d, course, d['info_dict'].get('playlist_index') or 0)],
+            # Fetch DASH/HLS fragments in parallel; no-ops for progressive files
+            'concurrent_fragment_downloads': 8,
+            'http_chunk_size': 10 * 1024 * 1024,
+            'retries': 10,
+            'fragment_retries': 10,
         }
+        if shutil.which('aria2c'):
+            ydl_opts['external_downloader'] = 'aria2c'
+            ydl_opts['external_downloader_args'] = ['-x', '8', '-s', '8']
         
         try:
+            import yt_dlp
+            LectureNumberPP = get_lecture_number_pp()
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([video_info['url']])
-            return True
+                ydl.add_post_processor(LectureNumberPP(lecture_nums, functools.partial(self.announce_lecture, course)), when='pre_process')
+                ydl.add_post_hook(finished.append)  # Called once per fully processed video
+                ydl.download(list(lecture_nums))
         except Exception as e:
-            print(f"\n   ❌ Error downloading: {e}")
-            return False
+            if self._cancel.is_set():
+                return len(finished)  # Interrupted on purpose; nothing to report
+            self._progress_q.put_nowait(('message', f"   ❌ Error downloading: {e}"))
+        
+        return len(finished)
     
-    def progress_hook(self, d, lecture_num):
-        """Display download progress"""
+    def check_cancelled(self):
+        """Abort the calling yt-dlp download once the run has been interrupted"""
+        if self._cancel.is_set():
+            from yt_dlp.utils import DownloadCancelled
+            raise DownloadCancelled('Download interrupted by user')
+    
+    def lecture_label(self, key) -> str:
+        """Name a (course, lecture_num) board key for display"""
+        course, lecture_num = key
+        return f"[{course[:COURSE_TAG_LEN]}] Lecture {lecture_num:03d}"
+    
+    def announce_lecture(self, course: str, lecture_num: int, title: str):
+        """Display the lecture that is about to download"""
+        self.check_cancelled()
+        self._progress_q.put_nowait(('message', f"\n📹 {self.lecture_label((course, lecture_num))}: {title[:60]}..."))
+    
+    def progress_hook(self, d, course, lecture_num):
+        """Hand download progress to the printer thread"""
+        self.check_cancelled()
         if d['status'] == 'downloading':
-            percent = d.get('_percent_str', 'N/A').strip()
-            speed = d.get('_speed_str', 'N/A').strip()
-            eta = d.get('eta', 0)
+            self._progress_q.put_nowait(('progress', (course, lecture_num), d.get('_percent_str'), d.get('_speed_str'), d.get('eta')))
+        elif d['status'] == 'finished':
+            self._progress_q.put_nowait(('finished', (course, lecture_num)))
+    
+    def format_progress(self, key, percent, speed, eta) -> str:
+        """Build the status line for a downloading lecture"""
+        # Convert ETA to readable format
+        if eta and eta > 0:
+            mins, secs = divmod(eta, 60)
+            eta_str = f"{int(mins)}m {int(secs)}s"
+        else:
+            eta_str = "calculating..."
+        
+        percent = (percent or 'N/A').strip()
+        speed = (speed or 'N/A').strip()
+        return f"   📥 {self.lecture_label(key)}: {percent} | Speed: {speed} | ETA: {eta_str}"
+    
+    def _printer_loop(self):
+        """Draw a status board with one line per downloading lecture
+        
+        Progress ticks only update the board in memory; the board is redrawn
+        at most every REDRAW_INTERVAL seconds, or straight away when there is
+        a permanent line to print.
+        """
+        board = {}  # (course, lecture_num) -> latest (percent, speed, eta)
+        drawn = 0   # Board lines currently on screen
+        dirty = False  # Board changed since it was last drawn
+        last_draw = 0.0
+        
+        while True:
+            timeout = max(0.0, last_draw + REDRAW_INTERVAL - time.monotonic()) if dirty else None
+            try:
+                event = self._progress_q.get(timeout=timeout)
+            except queue.Empty:
+                event = None
+            kind = event[0] if event else None
             
-            # Convert ETA to readable format
-            if eta and eta > 0:
-                mins, secs = divmod(eta, 60)
-                eta_str = f"{int(mins)}m {int(secs)}s"
-            else:
-                eta_str = "calculating..."
+            lines = []
+            if kind == 'message':
+                lines.append(event[1])
+            elif kind == 'finished':
+                board.pop(event[1], None)
+                lines.append(f"   ✅ {self.lecture_label(event[1])}: Download complete, merging audio/video...")
+            elif kind == 'progress':
+                board[event[1]] = event[2:]
+                dirty = self._draw_board
+            elif kind == 'reset':
+                # One course is done: drop its leftover lines (e.g. a failed
+                # lecture) but keep other playlists' lines on the board
+                for key in [key for key in board if key[0] == event[1]]:
+                    del board[key]
+                dirty = self._draw_board
             
-            print(f"\r   📥 Lecture {lecture_num:03d}: {percent} | Speed: {speed} | ETA: {eta_str}        ", end='')
+            if not self._draw_board:
+                if lines:
+                    print('\n'.join(lines), flush=True)
+            elif lines or (dirty and time.monotonic() - last_draw >= REDRAW_INTERVAL):
+                # Move up over the old board and clear it, print new permanent
+                # lines above the board, then redraw the board underneath
+                out = f"\033[{drawn}A\033[J" if drawn else ""
+                out += ''.join(line + '\n' for line in lines)
+                out += ''.join(self.format_progress(key, *stats) + '\n' for key, stats in board.items())
+                drawn = len(board)
+                sys.stdout.write(out)
+                sys.stdout.flush()
+                dirty = False
+                last_draw = time.monotonic()
             
-        elif d['status'] == 'finished':
-            print(f"\r   ✅ Lecture {lecture_num:03d}: Download complete, merging audio/video...        ")
+            if event:
+                self._progress_q.task_done()
+    
+    async def download_all(self, available: list, output_path: str):
+        """Download (lecture_num, url) pairs in `self.concurrency` parallel batches
+        
+        Returns (downloaded, failed) counts.
+        """
+        # Round-robin so every batch works through the course roughly in order
+        batches = [available[k::self.concurrency] for k in range(self.concurrency)]
+        batches = [batch for batch in batches if batch]
+        
+        loop = asyncio.get_running_loop()
+        pool = ThreadPoolExecutor(max_workers=self.concurrency)
+        try:
+            tasks = [loop.run_in_executor(pool, self.download_batch, batch, output_path) for batch in batches]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        except BaseException:
+            # Ctrl-C: waiting for the pool would finish every batch first, so
+            # make the progress hooks abort yt-dlp and drop what hasn't started
+            self._cancel.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        pool.shutdown()
+        
+        # Let the printer catch up before the summary is printed
+        self._progress_q.put_nowait(('reset', os.path.basename(output_path)))
+        await asyncio.to_thread(self._progress_q.join)
+        
+        # A crashed batch counts as entirely failed
+        downloaded = sum(r for r in results if isinstance(r, int))
+        return downloaded, len(available) - downloaded
     
-    def download_playlist(self, playlist_url: str):
+    async def download_playlists(self, playlist_ids: list):
+        """Download several playlists at the same time"""
+        await asyncio.gather(*[self.download_playlist(playlist_id) for playlist_id in playlist_ids])
+    
+    async def download_playlist(self, playlist_id: str):
         """Download entire playlist"""
-        # Get playlist info
-        playlist_title, total_videos = self.extract_playlist_info(playlist_url)
+        # Get playlist info and all video URLs in one pass
+        playlist_meta, videos = await asyncio.to_thread(self.get_all_video_urls, playlist_id)
         
-        if not playlist_title:
-            print("❌ Could not access playlist. Please check the URL.")
+        if not playlist_meta:
+            self.say("❌ Could not access playlist. Please check the URL.")
             return
         
-        if total_videos == 0:
-            print("❌ No videos found in the playlist!")
+        if not videos:
+            self.say("❌ No videos found in the playlist!")
             return
         
         # Create course folder
-        course_folder = self.sanitize_filename(playlist_title)
+        course_folder = self.sanitize_filename(playlist_meta['title'])
         course_path = os.path.join(self.base_download_path, course_folder)
         os.makedirs(course_path, exist_ok=True)
         
-        print(f"\n📁 Download folder: {course_path}")
+        self.say(f"\n📁 Download folder: {course_path}")
         
-        # Get all video URLs
-        videos = self.get_all_video_urls(playlist_url)
+        # Split once into lectures to fetch and lectures to skip
+        archived = self.load_archive(course_path)
+        available = []
+        already_downloaded = 0
+        for lecture_num, video_id, url in zip(videos.indices, videos.ids, videos.urls):
+            if not url:
+                continue
+            if video_id in archived:
+                already_downloaded += 1
+            else:
+                available.append((lecture_num, url))
+        skipped = len(videos) - len(available) - already_downloaded
         
-        if not videos:
-            print("❌ Could not fetch video information!")
+        if skipped > 0:
+            self.say(f"⚠️  {skipped} videos are unavailable or private and will be skipped")
+        if already_downloaded > 0:
+            self.say(f"⏭️  {already_downloaded} videos were already downloaded earlier")
+        
+        if not available:
+            self.say("✅ Nothing left to download!")
             return
         
         # Confirm download
-        available_videos = [v for v in videos if v['url']]
-        print(f"\n📊 Ready to download {len(available_videos)} videos")
+        self.say(f"\n📊 Ready to download {len(available)} videos")
         
-        confirm = input("⚠️  Start downloading? (y/n): ").lower()
-        if confirm != 'y':
-            print("❌ Download cancelled")
-            return
+        if not self.auto_confirm:
+            await asyncio.to_thread(self._progress_q.join)  # Show everything above before prompting
+            confirm = input("⚠️  Start downloading? (y/n): ").lower()
+            if confirm != 'y':
+                self.say("❌ Download cancelled")
+                return
         
         # Download all videos
-        print(f"\n🚀 Starting download of {len(available_videos)} videos...")
-        print("=" * 60)
-        
-        downloaded = 0
-        failed = 0
-        skipped = 0
+        self.say(f"\n🚀 Starting download of {len(available)} videos ({self.concurrency} at a time)...")
+        self.say("=" * 60)
         
-        for i, video in enumerate(videos, 1):
-            print(f"\n📹 [{i}/{len(videos)}] {video['title'][:60]}...")
-            
-            if not video['url']:
-                skipped += 1
-                print("   ⚠️  Video unavailable, skipping...")
-                continue
-            
-            success = self.download_video(video, course_path)
-            
-            if success:
-                downloaded += 1
-            else:
-                failed += 1
-            
-            # Show progress summary
-            print(f"   Progress: ✅ {downloaded} downloaded | ❌ {failed} failed | ⚠️  {skipped} skipped")
+        downloaded, failed = await self.download_all(available, course_path)
         
         # Final summary
-        print("\n" + "=" * 60)
-        print("📊 DOWNLOAD COMPLETE!")
-        print(f"✅ Successfully downloaded: {downloaded}/{len(videos)} videos")
+        self.say("\n" + "=" * 60)
+        self.say("📊 DOWNLOAD COMPLETE!")
+        self.say(f"✅ Successfully downloaded: {downloaded}/{len(videos)} videos")
         if failed > 0:
-            print(f"❌ Failed downloads: {failed}")
+            self.say(f"❌ Failed downloads: {failed}")
         if skipped > 0:
-            print(f"⚠️  Skipped (unavailable): {skipped}")
-        print(f"📁 All videos saved to: {course_path}")
-        print("=" * 60)
+            self.say(f"⚠️  Skipped (unavailable): {skipped}")
+        if already_downloaded > 0:
+            self.say(f"⏭️  Already downloaded earlier: {already_downloaded}")
+        self.say(f"📁 All videos saved to: {course_path}")
+        self.say("=" * 60)
     
     def run(self):
         """Main execution"""
@@ -237,49 +500,86 @@ class NPTELDownloader:
         print("2. Copy the playlist URL from your browser")
         print("3. Paste it here")
         
-        while True:
-            playlist_url = input("\n🔗 Paste playlist URL (or 'q' to quit): ").strip()
-            
-            if playlist_url.lower() == 'q':
-                print("👋 Goodbye!")
-                break
-            
-            if not playlist_url:
-                print("❌ URL cannot be empty!")
-                continue
-            
-            # Basic URL validation
-            if 'youtube.com' not in playlist_url and 'youtu.be' not in playlist_url:
-                print("❌ Please provide a valid YouTube playlist URL")
-                print("   Example: https://www.youtube.com/playlist?list=...")
-                continue
-            
-            # Download the playlist
-            self.download_playlist(playlist_url)
-            
-            # Ask if user wants to download another
-            another = input("\n🔄 Download another playlist? (y/n): ").lower()
-            if another != 'y':
-                print("👋 Goodbye!")
-                break
+        try:
+            while True:
+                playlist_url = input("\n🔗 Paste playlist URL (or 'q' to quit): ").strip()
+                
+                if playlist_url.lower() == 'q':
+                    print("👋 Goodbye!")
+                    break
+                
+                if not playlist_url:
+                    print("❌ URL cannot be empty!")
+                    continue
+                
+                # Validate and pull out the playlist ID in one pass
+                playlist_id = parse_playlist_id(playlist_url)
+                if not playlist_id:
+                    print("❌ Please provide a valid YouTube playlist URL")
+                    print("   Example: https://www.youtube.com/playlist?list=...")
+                    continue
+                
+                # Download the playlist
+                asyncio.run(self.download_playlist(playlist_id))
+                self._progress_q.join()
+                
+                # Ask if user wants to download another
+                another = input("\n🔄 Download another playlist? (y/n): ").lower()
+                if another != 'y':
+                    print("👋 Goodbye!")
+                    break
+        finally:
+            self.close()
+    
+    def run_batch(self, playlist_urls: list):
+        """Download the given playlists without the interactive prompts"""
+        playlist_ids = []
+        for url in playlist_urls:
+            playlist_id = parse_playlist_id(url)
+            if playlist_id:
+                playlist_ids.append(playlist_id)
+            else:
+                print(f"❌ Skipping invalid YouTube playlist URL: {url}")
+        
+        try:
+            asyncio.run(self.download_playlists(playlist_ids))
+        finally:
+            self._progress_q.join()  # The printer is a daemon thread; let it finish first
+            self.close()
+
+def read_batch_file(path: str) -> list:
+    """Read playlist URLs from a file, one per line ('#' starts a comment)"""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+def build_argparser():
+    p = argparse.ArgumentParser(description="Download complete NPTEL course playlists from YouTube.")
+    p.add_argument("urls", nargs="*", help="Playlist URLs to download (skips the interactive prompts)")
+    p.add_argument("-a", "--batch-file", help="File with one playlist URL per line")
+    p.add_argument("-y", "--yes", action="store_true", help="Start downloading without asking for confirmation")
+    p.add_argument("--refresh", action="store_true", help="Ignore cached playlist listings and refetch them")
+    return p
 
 def main():
     """Main entry point"""
-    # Check for required package
-    try:
-        import yt_dlp
-    except ImportError:
-        print("❌ Required package 'yt-dlp' not found!")
-        print("📦 Install it using: pip install yt-dlp")
-        print("\nRun this command:")
-        print("   pip install yt-dlp")
-        sys.exit(1)
+    args = build_argparser().parse_args()
+    
+    urls = list(args.urls)
+    if args.batch_file:
+        try:
+            urls += read_batch_file(args.batch_file)
+        except OSError as e:
+            print(f"❌ Could not read batch file: {e}")
+            sys.exit(1)
     
-    # Create and run downloader
-    downloader = NPTELDownloader()
+    # Create and run downloader; URLs on the command line mean no prompts
+    downloader = NPTELDownloader(refresh=args.refresh, auto_confirm=args.yes or bool(urls))
     
     try:
-        downloader.run()
+        if urls:
+            downloader.run_batch(urls)
+        else:
+            downloader.run()
     except KeyboardInterrupt:
         print("\n\n⚠️  Download interrupted by user")
         sys.exit(0)
@@ -1,7 +1,13 @@
 # scap_min_fix.py
-import csv, time, tempfile, shutil
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio, csv, itertools, mmap, os, queue, re, threading, time, tempfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from pathlib import Path
+from urllib.parse import unquote, urlsplit
+from urllib.request import urlopen
+import aiohttp
+import orjson
+import websocket
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
@@ -17,15 +23,45 @@ DOWNLOADS = Path("downloads").resolve()
 WAIT       = 45
 HEADLESS   = False
 CONCURRENCY = 4  # adjust to 16+ if your machine and the site can handle it
+MAX_CONCURRENCY = 16  # ceiling for the adaptive controller in run()
+MONITOR_INTERVAL = 15  # seconds between throughput samples
+# seconds without a heartbeat before a worker's browser is restarted. Workers beat
+# between steps, per download event and per direct-fetch chunk, so the longest
+# healthy silence is wait_for_download's 90 s wait for the download to begin
+STUCK_AFTER = 150
+RECYCLE_AFTER = int(os.environ.get("RECYCLE_AFTER", "100"))  # restart a browser after this many queries
+# resources the renderer never needs to fetch; stylesheets stay, the site's
+# visibility checks (is_displayed / element_to_be_clickable) depend on them
+BLOCKED_URLS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+                "*.woff", "*.woff2", "*.ttf", "*.otf", "*.mp4", "*.webm"]
+RANGE_PARTS = 4  # parallel Range requests for large direct downloads
+RANGE_MIN_SIZE = 8 * 1024 * 1024  # below this a single GET is just as fast
+_POOL: "queue.Queue" = queue.Queue()  # idle pre-launched browsers, filled by run()
+_DRIVER_PATH: str | None = None  # chromedriver found by Selenium Manager on the first launch
+_SERVICE_LOCK = threading.Lock()
+_NAV_ORDER = ["direct", "js", "new_tab", "cdp"]  # force_nav strategies, last winner first
+_NAV_LOCK = threading.Lock()
+_LOG: "queue.SimpleQueue" = queue.SimpleQueue()  # (n, query, status, detail) rows for log_writer
+
+@dataclass(frozen=True)
+class WorkerConfig:
+    """Settings a worker needs, passed in explicitly instead of read from module globals."""
+    site_url: str = SITE_URL
+    downloads: Path = DOWNLOADS
+    wait: int = WAIT
+
 def build_driver(download_dir: Path | None = None):
     base_dir = download_dir or DOWNLOADS
     base_dir.mkdir(parents=True, exist_ok=True)
     snap_common = Path.home() / "snap" / "chromium" / "common"
     cache_root = (snap_common if snap_common.exists() else Path.home() / ".cache") / "selenium_profiles"
     cache_root.mkdir(parents=True, exist_ok=True)
-    user_data = None
+    profile = tempfile.TemporaryDirectory(prefix="chromium_profile_", dir=str(cache_root), ignore_cleanup_errors=True)
+    user_data = profile.name
 
     opts = Options()
+    # return from get() at DOMContentLoaded; we wait for the elements we need ourselves
+    opts.page_load_strategy = "eager"
     # Point to your system Chromium if needed:
     for p in ("/usr/bin/chromium-browser", "/usr/bin/chromium", "/snap/bin/chromium"):
         if Path(p).exists(): opts.binary_location = p; break
@@ -45,11 +81,14 @@ def build_driver(download_dir: Path | None = None):
     opts.add_argument("--disable-search-engine-choice-screen")
     opts.add_argument("--password-store=basic")
     opts.add_argument("--use-mock-keychain")
+    # we only read result text and links; skip images and a couple of background features
+    opts.add_argument("--blink-settings=imagesEnabled=false")
+    opts.add_argument("--disable-features=InterestCohort,Translate")
 
     # silent downloads
     opts.add_experimental_option("prefs", {
         # Downloads
-        "download.default_directory": str(DOWNLOADS),
+        "download.default_directory": str(base_dir),
         "download.prompt_for_download": False,
         "download.directory_upgrade": True,
         "safebrowsing.enabled": True,
@@ -59,61 +98,189 @@ def build_driver(download_dir: Path | None = None):
         "profile.managed_default_content_settings.notifications": 1,
     })
 
-    service = ChromeService()  # Selenium Manager fetches chromedriver
+    global _DRIVER_PATH
+    with _SERVICE_LOCK:
+        # Selenium Manager only has to locate/fetch chromedriver once per run
+        driver_path = _DRIVER_PATH
+    service = ChromeService(executable_path=driver_path) if driver_path else ChromeService()
     # retry up to 3 times with fresh user-data-dirs if we hit profile lock
     last_err = None
     for attempt in range(3):
+        if attempt:
+            profile.cleanup()
+            profile = tempfile.TemporaryDirectory(prefix="chromium_profile_", dir=str(cache_root), ignore_cleanup_errors=True)
+            user_data = profile.name
+            # swap only the profile flag, everything else stays as built above
+            opts.arguments[:] = [a for a in opts.arguments if not a.startswith("--user-data-dir=")]
+            opts.add_argument(f"--user-data-dir={user_data}")
         try:
-            if user_data is not None and Path(user_data).exists():
-                shutil.rmtree(user_data, ignore_errors=True)
-            user_data = tempfile.mkdtemp(prefix="chromium_profile_", dir=str(cache_root))
-            # refresh the argument for user-data-dir
-            try:
-                # remove any previous flag occurrences by rebuilding Options
-                opts2 = Options()
-                for p in ("/usr/bin/chromium-browser", "/usr/bin/chromium", "/snap/bin/chromium"):
-                    if Path(p).exists(): opts2.binary_location = p; break
-                if HEADLESS:
-                    opts2.add_argument("--headless=new")
-                opts2.add_argument("--no-sandbox")
-                opts2.add_argument("--disable-dev-shm-usage")
-                opts2.add_argument("--window-size=1280,900")
-                opts2.add_argument(f"--user-data-dir={user_data}")
-                opts2.add_argument("--remote-debugging-port=0")
-                opts2.add_argument("--no-first-run")
-                opts2.add_argument("--no-default-browser-check")
-                opts2.add_argument("--disable-search-engine-choice-screen")
-                opts2.add_argument("--password-store=basic")
-                opts2.add_argument("--use-mock-keychain")
-                opts2.add_experimental_option("prefs", {
-                    "download.default_directory": str(base_dir),
-                    "download.prompt_for_download": False,
-                    "download.directory_upgrade": True,
-                    "safebrowsing.enabled": True,
-                    "profile.default_content_setting_values.automatic_downloads": 1,
-                    "profile.default_content_setting_values.notifications": 1,
-                    "profile.managed_default_content_settings.notifications": 1,
-                })
-                d = webdriver.Chrome(service=service, options=opts2)
-                d._temp_user_data = user_data
-                return d
-            except SessionNotCreatedException as e:
-                last_err = e
-                continue
+            d = webdriver.Chrome(service=service, options=opts)
+            with _SERVICE_LOCK:
+                if _DRIVER_PATH is None:
+                    _DRIVER_PATH = service.path
+            d._temp_ctx = profile
+            return d
         except SessionNotCreatedException as e:
             last_err = e
             time.sleep(1)
-            continue
+    profile.cleanup()
     raise last_err or RuntimeError("Failed to create Chrome session after retries")
 
+class CDPSession:
+    """Direct DevTools connection to the browser target, next to chromedriver's.
+    Commands skip chromedriver's HTTP hop and events are pushed to us, so the
+    download wait blocks on a queue instead of polling a log."""
+
+    def __init__(self, d):
+        addr = d.capabilities["goog:chromeOptions"]["debuggerAddress"]
+        with urlopen(f"http://{addr}/json/version", timeout=10) as resp:
+            ws_url = orjson.loads(resp.read())["webSocketDebuggerUrl"]
+        self.ws = websocket.create_connection(ws_url, suppress_origin=True, enable_multithread=True)
+        self.events: "queue.Queue" = queue.Queue()  # (method, params) for every pushed event
+        self._ids = itertools.count(1)
+        self._pending: dict[int, "queue.SimpleQueue"] = {}
+        self._lock = threading.Lock()
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        try:
+            while True:
+                msg = orjson.loads(self.ws.recv())
+                if "id" in msg:
+                    with self._lock:
+                        waiter = self._pending.pop(msg["id"], None)
+                    if waiter is not None:
+                        waiter.put(msg)
+                else:
+                    self.events.put((msg.get("method"), msg.get("params", {})))
+        except Exception:
+            # socket closed with the browser: wake anyone blocked on events
+            self.events.put((None, {}))
+
+    def send(self, method: str, params: dict | None = None, timeout: float = 30):
+        waiter: "queue.SimpleQueue" = queue.SimpleQueue()
+        with self._lock:
+            mid = next(self._ids)
+            self._pending[mid] = waiter
+        self.ws.send(orjson.dumps({"id": mid, "method": method, "params": params or {}}).decode())
+        try:
+            msg = waiter.get(timeout=timeout)
+        except queue.Empty:
+            with self._lock:
+                self._pending.pop(mid, None)
+            raise TimeoutError(f"CDP {method} timed out")
+        if "error" in msg:
+            raise RuntimeError(f"CDP {method}: {msg['error'].get('message')}")
+        return msg.get("result", {})
+
+    def drain(self):
+        while True:
+            try:
+                self.events.get_nowait()
+            except queue.Empty:
+                return
+
+    def close(self):
+        try: self.ws.close()
+        except Exception: pass
+
 def cleanup_driver(d):
+    cdp = getattr(d, "_cdp", None)
+    if cdp: cdp.close()
     try: d.quit()
     finally:
-        tmp = getattr(d, "_temp_user_data", None)
-        if tmp and Path(tmp).exists(): shutil.rmtree(tmp, ignore_errors=True)
+        tmp = getattr(d, "_temp_ctx", None)
+        if tmp: tmp.cleanup()
+
+class RunStats:
+    """Progress shared between the workers and the concurrency controller."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.completed = 0
+        self.last_progress: dict[int, float] = {}  # worker_id -> when it last finished a query
+        self.drivers: dict[int, object] = {}  # worker_id -> the browser it is using
+        self.killed: set[int] = set()  # workers whose browser the controller shut down
+        self.retire = 0  # workers asked to stop after their current query
+
+    def attach(self, worker_id: int, d):
+        with self.lock:
+            self.drivers[worker_id] = d
+            self.last_progress[worker_id] = time.time()
+            self.killed.discard(worker_id)
+
+    def detach(self, worker_id: int) -> bool:
+        """Forget a worker; True if the controller had shut its browser down."""
+        with self.lock:
+            self.drivers.pop(worker_id, None)
+            self.last_progress.pop(worker_id, None)
+            return worker_id in self.killed
+
+    def finished_query(self, worker_id: int):
+        with self.lock:
+            self.completed += 1
+            self.last_progress[worker_id] = time.time()
+
+    def beat(self, worker_id: int):
+        """Record that a worker is still making progress within its current query."""
+        with self.lock:
+            self.last_progress[worker_id] = time.time()
+
+    def should_retire(self) -> bool:
+        with self.lock:
+            if self.retire > 0:
+                self.retire -= 1
+                return True
+            return False
+
+    def kill_stuck(self, now: float) -> list[int]:
+        """Shut down the browser of every worker that hasn't sent a heartbeat in
+        STUCK_AFTER seconds; its blocked WebDriver call or download wait then
+        fails and the worker relaunches a browser."""
+        with self.lock:
+            stuck = [wid for wid, t in self.last_progress.items()
+                     if now - t > STUCK_AFTER and wid not in self.killed]
+            doomed = [(wid, self.drivers.get(wid)) for wid in stuck]
+            self.killed.update(stuck)
+        for wid, d in doomed:
+            if d is not None:
+                try: cleanup_driver(d)
+                except Exception: pass
+        return stuck
+
+def launch_worker_driver(worker_dir: Path):
+    """Build a browser with its own download folder and bookkeeping attached."""
+    d = build_driver(download_dir=worker_dir)
+    # downloads from any tab of this browser land in worker_dir and are
+    # reported as Browser.downloadWillBegin/downloadProgress events
+    d._cdp = CDPSession(d)
+    d._cdp.send("Browser.setDownloadBehavior",
+                {"behavior": "allow", "downloadPath": str(worker_dir), "eventsEnabled": True})
+    d.execute_cdp_cmd("Network.enable", {})
+    d.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+    d._download_dir = worker_dir
+    d._pages_processed = 0
+    d._user_agent = d.execute_script("return navigator.userAgent")
+    return d
+
+def fill_pool(n: int):
+    """Launch n browsers one after another (not in parallel, so they don't race
+    on profile locks) and park them in _POOL for the workers."""
+    for wid in range(n):
+        _POOL.put(launch_worker_driver(DOWNLOADS / f"worker_{wid+1}"))
+        time.sleep(0.15)
+
+def drain_pool():
+    while True:
+        try:
+            d = _POOL.get_nowait()
+        except queue.Empty:
+            return
+        cleanup_driver(d)
 
 def _wait_ready(d, timeout=15):
-    WebDriverWait(d, timeout).until(lambda drv: drv.execute_script("return document.readyState") == "complete")
+    # "interactive" is enough: the DOM is parsed, only subresources are still loading
+    WebDriverWait(d, timeout).until(lambda drv: drv.execute_script("return document.readyState") in ("interactive", "complete"))
 
 def grant_notifications(d):
     """Grant notifications permission for the current top-level origin via CDP."""
@@ -127,74 +294,157 @@ def grant_notifications(d):
         except Exception:
             pass
 
-def wait_for_download(new_after_ts: float, timeout: int = 90, download_dir: Path | None = None) -> Path | None:
-    """Track the download that starts after new_after_ts by following its .crdownload file.
-    This ties a specific click to the specific partial file to avoid cross-thread confusion.
+def _backoff(start: float = 0.02, cap: float = 0.5):
+    """Poll delays: quick checks first, growing x1.5 up to cap for long waits."""
+    delay = start
+    while True:
+        yield delay
+        delay = min(delay * 1.5, cap)
+
+def wait_for_download(d, start_timeout: int = 90, timeout: int = 120, on_event=None) -> Path | None:
+    """Follow the download started by the last click through DevTools events.
+    The first downloadWillBegin gives the guid and file name; we then wait for
+    that guid's downloadProgress to report 'completed'. This ties a specific
+    click to a specific file, so workers can't pick up each other's downloads.
+    on_event is called for every event received (used as a worker heartbeat).
     """
-    end = time.time() + timeout
-    ddir = download_dir or DOWNLOADS
-    candidate: Path | None = None
-    # Phase 1: find the .crdownload that started for this click
-    while time.time() < end:
-        latest = None
-        for p in ddir.glob('*.crdownload'):
-            try:
-                st = p.stat()
-            except FileNotFoundError:
-                continue
-            if st.st_mtime >= new_after_ts:
-                if latest is None or st.st_mtime > latest[1]:
-                    latest = (p, st.st_mtime)
-        if latest:
-            candidate = latest[0]
+    guid = name = None
+    end = time.time() + start_timeout
+    while (remaining := end - time.time()) > 0:
+        try:
+            method, params = d._cdp.events.get(timeout=remaining)
+        except queue.Empty:
             break
-        time.sleep(0.2)
-    if candidate is None:
-        # Fallback: look for a new non-hidden, non-temp file created after click
-        for p in ddir.glob('*'):
-            if p.name.startswith('.') or p.suffix == '.crdownload':
-                continue
-            try:
-                if p.stat().st_mtime >= new_after_ts and p.is_file():
-                    return p
-            except FileNotFoundError:
-                pass
-        return None
-    # Phase 2: wait for that .crdownload to disappear, then return the final file
-    target_stem = candidate.name[:-len('.crdownload')]
-    while time.time() < end:
-        if not candidate.exists():
-            final = ddir / target_stem
-            if final.exists() and final.is_file():
-                return final
-            # Some sites rename; return any new non-temp created after click
-            for p in ddir.glob('*'):
-                if p.name.startswith('.') or p.suffix == '.crdownload':
-                    continue
-                try:
-                    if p.stat().st_mtime >= new_after_ts and p.is_file():
-                        return p
-                except FileNotFoundError:
-                    continue
-        time.sleep(0.3)
+        if method is None:
+            raise RuntimeError("DevTools connection closed")
+        if on_event:
+            on_event()
+        if guid is None and method == "Browser.downloadWillBegin":
+            guid, name = params["guid"], params["suggestedFilename"]
+            end = time.time() + timeout
+        elif method == "Browser.downloadProgress" and params.get("guid") == guid:
+            if params.get("state") == "completed":
+                return d._download_dir / name
+            if params.get("state") == "canceled":
+                return None
     return None
 
+AUDIO_EXTS = {".mp3", ".m4a", ".aac", ".ogg", ".opus", ".wav", ".flac", ".webm"}
+
+def _ensure_audio(resp):
+    """Raise unless the response is a file download rather than an HTML page:
+    an audio/* or octet-stream body, or an attachment disposition."""
+    ctype = resp.headers.get("Content-Type", "").split(";")[0].strip().lower()
+    disposition = resp.headers.get("Content-Disposition", "").lower()
+    if not (ctype.startswith("audio/") or ctype == "application/octet-stream"
+            or disposition.startswith("attachment")):
+        raise aiohttp.ClientError(f"not an audio download ({ctype or 'no content type'})")
+
+def _filename_from(resp, url: str) -> str:
+    cd = resp.headers.get("Content-Disposition", "")
+    m = re.search(r"filename\*?=(?:UTF-8'')?\"?([^\";]+)", cd, re.I)
+    name = unquote(m.group(1) if m else Path(urlsplit(url).path).name)
+    name = re.sub(r'[\\/:*?"<>|]', "_", name).strip() or "download"
+    # URL basenames like "get.php" or "abc123" still have to land as audio files
+    if Path(name).suffix.lower() not in AUDIO_EXTS:
+        name = f"{Path(name).stem or 'download'}.mp3"
+    return name
+
+async def _fetch_direct(url: str, dest_dir: Path, headers: dict, on_chunk=None) -> Path:
+    """Download url into dest_dir without the browser. Large files on servers that
+    accept byte ranges are fetched as RANGE_PARTS concurrent Range requests
+    written straight into an mmap of the final file; everything else is a
+    single streamed GET. on_chunk is called per received chunk (worker heartbeat)."""
+    async with aiohttp.ClientSession(headers=headers, timeout=aiohttp.ClientTimeout(total=120)) as session:
+        async with session.head(url, allow_redirects=True) as head:
+            head.raise_for_status()
+            _ensure_audio(head)
+            size = int(head.headers.get("Content-Length") or 0)
+            ranged = head.headers.get("Accept-Ranges", "").lower() == "bytes"
+            name = _filename_from(head, url)
+            url = str(head.url)
+        target = dest_dir / name
+        try:
+            if not (ranged and size > RANGE_MIN_SIZE):
+                async with session.get(url) as resp:
+                    resp.raise_for_status()
+                    _ensure_audio(resp)
+                    with open(target, "wb") as f:
+                        async for chunk in resp.content.iter_chunked(1 << 16):
+                            f.write(chunk)
+                            if on_chunk:
+                                on_chunk()
+                return target
+
+            with open(target, "wb") as f:
+                f.truncate(size)
+            with open(target, "r+b") as f, mmap.mmap(f.fileno(), size) as mm:
+                async def fetch_range(lo: int, hi: int):
+                    async with session.get(url, headers={"Range": f"bytes={lo}-{hi}"}) as resp:
+                        if resp.status != 206:
+                            raise aiohttp.ClientError(f"range request answered {resp.status}")
+                        _ensure_audio(resp)
+                        pos = lo
+                        async for chunk in resp.content.iter_chunked(1 << 16):
+                            mm[pos:pos + len(chunk)] = chunk
+                            pos += len(chunk)
+                            if on_chunk:
+                                on_chunk()
+                        if pos != hi + 1:
+                            raise aiohttp.ClientError(f"short range {lo}-{hi}")
+                step = -(-size // RANGE_PARTS)
+                await asyncio.gather(*(fetch_range(lo, min(lo + step, size) - 1) for lo in range(0, size, step)))
+            return target
+        except BaseException:
+            target.unlink(missing_ok=True)
+            raise
+
+def log_status(global_idx: int, query: str, status: str, detail: str = ""):
+    _LOG.put((global_idx + 1, query, status, detail))
+
+def log_writer():
+    """Only consumer of _LOG: appends outcome rows to OUTPUT_CSV and echoes every
+    row to the console, so workers never contend on stdout. Stops at None."""
+    new = not OUTPUT_CSV.exists()
+    # line-buffered: read_downloaded resumes from these rows, so each one must
+    # be on disk before a crash or kill, not when the run exits cleanly
+    with OUTPUT_CSV.open("a", newline="", encoding="utf-8", buffering=1) as f:
+        w = csv.writer(f)
+        if new:
+            w.writerow(["n", "query", "status", "detail"])
+        while (row := _LOG.get()) is not None:
+            n, query, status, detail = row
+            if status == "started":
+                print(f"[{n}] {query}")
+                continue
+            print(f"[{n}] -> {status}: {detail}" if detail else f"[{n}] -> {status}")
+            w.writerow(row)
+
 def force_nav(d, url):
     """Navigate robustly and make sure we're not stuck on the start page.
     We don't assume any particular element yet; just ensure load + correct origin.
     """
-    targets = [
-        ("direct", lambda: d.get(url)),
-        ("js", lambda: (d.get("about:blank"), d.execute_script("location.href = arguments[0];", url))),
-        ("new_tab", lambda: (d.switch_to.new_window("tab"), d.get(url))),
-        ("cdp", lambda: (d.get("about:blank"), d.execute_cdp_cmd("Page.navigate", {"url": url}))),
-    ]
+    targets = {
+        "direct": lambda: d.get(url),
+        "js": lambda: (d.get("about:blank"), d.execute_script("location.href = arguments[0];", url)),
+        "new_tab": lambda: (d.switch_to.new_window("tab"), d.get(url)),
+        "cdp": lambda: (d.get("about:blank"), d.execute_cdp_cmd("Page.navigate", {"url": url})),
+    }
+    # any mp3juice page (home or results) has a search box, so stay where we are
+    if "mp3juice" in (d.current_url or "").lower():
+        return
+    with _NAV_LOCK:
+        order = list(_NAV_ORDER)
     last_err = None
-    for label, action in targets:
+    for label in order:
         try:
-            action()
-            _wait_ready(d, timeout=15)
+            targets[label]()
+            _wait_ready(d, timeout=8)
             if "mp3juice" in (d.current_url or "").lower():
+                # move-to-front: the strategy that worked is tried first next time
+                with _NAV_LOCK:
+                    _NAV_ORDER.remove(label)
+                    _NAV_ORDER.insert(0, label)
                 return
         except Exception as e:
             last_err = e
@@ -203,14 +453,31 @@ def force_nav(d, url):
     raise last_err or RuntimeError("Failed to navigate to site")
 
 def read_queries():
+    # plain csv.reader + header positions: no per-row dict, same fallbacks as before
     with CSV_PATH.open(newline="", encoding="utf-8") as f:
-        for row in csv.DictReader(f):
-            t = (row.get("track_name") or "").strip()
-            u = (row.get("artist_name") or row.get("artist_names") or "").strip()
+        rows = csv.reader(f)
+        header = next(rows, [])
+        col = {name: i for i, name in enumerate(header)}
+        ti = col.get("track_name")
+        if ti is None:
+            return
+        artist_cols = [col[c] for c in ("artist_name", "artist_names") if c in col]
+        for row in rows:
+            t = row[ti].strip() if ti < len(row) else ""
             if not t:
                 continue
+            u = next((row[i] for i in artist_cols if i < len(row) and row[i]), "").strip()
             yield f"{t} - {u}" if u else t
 
+def read_downloaded():
+    """Queries an earlier run logged as downloaded (full "title - artist" text)."""
+    if not OUTPUT_CSV.exists():
+        return set()
+    with OUTPUT_CSV.open(newline="", encoding="utf-8") as f:
+        rows = csv.reader(f)
+        next(rows, None)
+        return {row[1] for row in rows if len(row) > 2 and row[2] == "downloaded"}
+
 def simplify_query(q: str) -> str:
     """Return a shorter, safer query focusing on the track title only.
     Examples:
@@ -226,6 +493,26 @@ def simplify_query(q: str) -> str:
         base = base[:90]
     return base
 
+# Scan the first 6 result blocks in the page for an "MP3 Download" link in one
+# round-trip; returns [block, link], [first block, null] or null if no results
+_JS_FIND_MP3 = """
+const blocks = Array.from(document.querySelectorAll('.result')).slice(0, 6);
+for (const b of blocks) {
+    for (const a of b.querySelectorAll('a')) {
+        if (a.textContent.replace(/\\s+/g, ' ').trim() === 'MP3 Download') return [b, a];
+    }
+}
+return blocks.length ? [blocks[0], null] : null;
+"""
+# One round-trip each: scroll the result into view and open its MP3 panel ...
+_JS_OPEN_MP3 = "arguments[0].scrollIntoView({block:'center'}); arguments[1].click();"
+# ... then keep the download in this tab, stub out popups and click it
+_JS_CLICK_DOWNLOAD = (
+    "arguments[0].setAttribute('target','_self');"
+    "try { window._origOpen = window.open; window.open = function(){ return null; }; } catch (e) {}"
+    "arguments[0].click();"
+)
+
 def close_new_tabs(d, baseline_handles: set[str], original_handle: str, grant_before_close: bool = True):
     """Close any newly opened tabs/windows not present in baseline_handles and
     return focus to original_handle.
@@ -246,21 +533,53 @@ def close_new_tabs(d, baseline_handles: set[str], original_handle: str, grant_be
     except Exception:
         pass
 
-def process_worker(worker_id: int, tasks: list[tuple[int, str]]):
-    """Persistent worker that reuses one browser and its download folder.
-    tasks: list of (global_index, query)
+def process_worker(cfg: WorkerConfig, worker_id: int, tasks: "queue.Queue", stats: RunStats):
+    """Persistent worker that borrows one browser (and its download folder) from _POOL
+    and keeps pulling (global_index, query) items off the shared tasks queue.
     """
-    worker_dir = DOWNLOADS / f"worker_{worker_id+1}"
-    d = build_driver(download_dir=worker_dir)
+    try:
+        d = _POOL.get_nowait()
+    except queue.Empty:
+        # the controller added a worker beyond the pre-launched ones
+        d = launch_worker_driver(cfg.downloads / f"worker_{worker_id+1}")
+    worker_dir = d._download_dir
+    stats.attach(worker_id, d)
     try:
         # small stagger to avoid stampede
-        time.sleep(0.25 * worker_id)
-        # If first task, navigate to home
-        if tasks:
-            force_nav(d, SITE_URL)
-            grant_notifications(d)
+        time.sleep(0.25 * min(worker_id, CONCURRENCY))
+        force_nav(d, cfg.site_url)
+        grant_notifications(d)
         # helper to search on current page (home or results page)
-        def search_here(q: str):
+        def find_cached(candidates, attr: str, wait: float = 1):
+            """First clickable, visible element among candidates. The locator that
+            matched last time is remembered on the driver (as `attr`) and tried
+            first, so the full probe only runs on a fresh browser or a page change.
+            Each candidate gets `wait` seconds; the cached one always gets 1 s."""
+            cached = getattr(d, attr, None)
+            if cached:
+                try:
+                    el = WebDriverWait(d, 1).until(EC.element_to_be_clickable(cached))
+                    if el.is_displayed():
+                        return el
+                except Exception:
+                    pass
+            for loc in candidates:
+                if loc == cached:
+                    continue
+                try:
+                    el = WebDriverWait(d, wait).until(EC.element_to_be_clickable(loc))
+                    if el and el.is_displayed():
+                        setattr(d, attr, loc)
+                        return el
+                except Exception:
+                    continue
+            return None
+
+        def beat():
+            stats.beat(worker_id)
+
+        def search_here(q: str, attempt: int = 0):
+            beat()
             input_candidates = [
                 (By.ID, "q"),
                 (By.NAME, "q"),
@@ -269,18 +588,18 @@ def process_worker(worker_id: int, tasks: list[tuple[int, str]]):
                 (By.CSS_SELECTOR, "input[type='search']"),
                 (By.CSS_SELECTOR, "form input[type='text']"),
             ]
-            box = None
-            for how, what in input_candidates:
-                try:
-                    box = WebDriverWait(d, 5).until(EC.element_to_be_clickable((how, what)))
-                    if box and box.is_displayed():
-                        break
-                except Exception:
-                    continue
+            box = find_cached(input_candidates, "_input_locator")
             if not box:
-                # if no box found, ensure we're on home and try again
-                force_nav(d, SITE_URL)
-                return search_here(q)
+                # no box: first just make sure we're still on the site (no load if we are),
+                # then reload home once; give up after that instead of recursing forever
+                if attempt == 0:
+                    force_nav(d, cfg.site_url)
+                elif attempt == 1:
+                    d.get(cfg.site_url)
+                    _wait_ready(d)
+                else:
+                    raise RuntimeError("search box not found")
+                return search_here(q, attempt + 1)
             # limit extremely long queries and fallback if needed
             original_q = q
             if len(q) > 140:
@@ -305,15 +624,14 @@ def process_worker(worker_id: int, tasks: list[tuple[int, str]]):
                 (By.XPATH, "//form//button"),
             ]
             clicked = False
-            for how, what in submit_candidates:
+            btn = find_cached(submit_candidates, "_submit_locator")
+            if btn:
                 try:
-                    btn = WebDriverWait(d, 5).until(EC.element_to_be_clickable((how, what)))
                     d.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
                     btn.click()
                     clicked = True
-                    break
                 except Exception:
-                    continue
+                    pass
             if not clicked:
                 from selenium.webdriver.common.keys import Keys
                 box.send_keys(Keys.ENTER)
@@ -327,137 +645,221 @@ def process_worker(worker_id: int, tasks: list[tuple[int, str]]):
                 if simp != q:
                     # try to find the input again on the current page
                     try:
-                        box2 = None
-                        for how, what in input_candidates:
-                            try:
-                                box2 = WebDriverWait(d, 3).until(EC.element_to_be_clickable((how, what)))
-                                if box2 and box2.is_displayed():
-                                    break
-                            except Exception:
-                                continue
+                        box2 = find_cached(input_candidates, "_input_locator", wait=3)
                         if box2:
                             box2.clear(); box2.send_keys(simp)
-                            for how, what in submit_candidates:
-                                try:
-                                    btn2 = WebDriverWait(d, 3).until(EC.element_to_be_clickable((how, what)))
-                                    d.execute_script("arguments[0].scrollIntoView({block:'center'});", btn2)
-                                    btn2.click(); break
-                                except Exception:
-                                    continue
+                            btn2 = find_cached(submit_candidates, "_submit_locator", wait=3)
+                            if btn2:
+                                d.execute_script("arguments[0].scrollIntoView({block:'center'});", btn2)
+                                btn2.click()
                         else:
-                            # navigate home and try again with simplified
-                            force_nav(d, SITE_URL)
-                            return search_here(simp)
+                            # back on the site if we left it, and try again with simplified
+                            force_nav(d, cfg.site_url)
+                            return search_here(simp, attempt + 1)
                     except Exception:
-                        # navigate home and try again if anything fails
-                        force_nav(d, SITE_URL)
-                        return search_here(simp)
+                        if attempt:
+                            raise
+                        # back on the site if we left it, and try again if anything fails
+                        force_nav(d, cfg.site_url)
+                        return search_here(simp, attempt + 1)
 
-        for global_idx, query in tasks:
-            print(f"[{global_idx+1}] {query}")
+        def handle_query(global_idx: int, query: str):
+            log_status(global_idx, query, "started")
             # Search on current page (results page has its own box)
             search_here(query)
 
             # Wait for results and locate target block
-            WebDriverWait(d, WAIT).until(EC.presence_of_element_located((By.CSS_SELECTOR, ".result")))
+            WebDriverWait(d, cfg.wait).until(EC.presence_of_element_located((By.CSS_SELECTOR, ".result")))
+            beat()
             time.sleep(0.5)
-            results = d.find_elements(By.CSS_SELECTOR, ".result")
-            if not results:
-                print(f"[{global_idx+1}] -> No results found")
-                continue
-            target_block, mp3_btn = None, None
-            for block in results[:6]:
-                try:
-                    mp3_btn = block.find_element(By.XPATH, ".//a[normalize-space()='MP3 Download']")
-                    target_block = block
-                    break
-                except Exception:
-                    continue
-            if target_block is None:
-                target_block = results[0]
-                mp3_btn = WebDriverWait(target_block, WAIT).until(EC.presence_of_element_located((By.XPATH, ".//a[normalize-space()='MP3 Download']")))
+            found = d.execute_script(_JS_FIND_MP3)
+            if not found:
+                log_status(global_idx, query, "no results")
+                return
+            target_block, mp3_btn = found
+            if mp3_btn is None:
+                mp3_btn = WebDriverWait(target_block, cfg.wait).until(EC.presence_of_element_located((By.XPATH, ".//a[normalize-space()='MP3 Download']")))
 
-            d.execute_script("arguments[0].scrollIntoView({block:'center'})", target_block)
-            d.execute_script("arguments[0].click();", mp3_btn)
+            d.execute_script(_JS_OPEN_MP3, target_block, mp3_btn)
+            beat()
 
             # Download link
-            dl_btn = WebDriverWait(target_block, WAIT).until(EC.presence_of_element_located((By.XPATH, ".//a[normalize-space()='Download']")))
+            dl_btn = WebDriverWait(target_block, cfg.wait).until(EC.presence_of_element_located((By.XPATH, ".//a[normalize-space()='Download']")))
             end = time.time() + 20
-            while time.time() < end and not (dl_btn.get_attribute("href") or "").startswith("http"):
-                time.sleep(0.2)
-            d.execute_script("arguments[0].setAttribute('target','_self');", dl_btn)
-            try:
-                d.execute_script("window._origOpen = window.open; window.open = function(){ return null; };")
-            except Exception:
-                pass
+            for delay in _backoff():
+                if time.time() >= end or (dl_btn.get_attribute("href") or "").startswith("http"):
+                    break
+                time.sleep(delay)
+            beat()
 
-            # Click and wait for any new file in this worker folder
-            before_names = {p.name for p in worker_dir.glob('*')}
-            # capture window handles to identify only new tabs spawned by this click
-            original = d.current_window_handle
-            before_handles = set(d.window_handles)
-            click_time = time.time()
-            d.execute_script("arguments[0].click();", dl_btn)
-            # wait for a new file (even hidden) to appear in worker_dir
-            end_watch = time.time() + 90
-            new_file: Path | None = None
-            while time.time() < end_watch and new_file is None:
-                for p in worker_dir.glob('*'):
-                    if p.name not in before_names:
-                        try:
-                            if p.stat().st_mtime >= click_time:
-                                new_file = p
-                                break
-                        except FileNotFoundError:
-                            continue
-                time.sleep(0.2)
-            # Restore popup behavior and close stray tabs (only those newly opened)
-            try:
-                d.execute_script("if (window._origOpen) window.open = window._origOpen;")
-            except Exception:
-                pass
-            close_new_tabs(d, baseline_handles=before_handles, original_handle=original, grant_before_close=True)
+            # Once the link is resolved, fetch it ourselves; the browser is only the fallback
+            got = None
+            href = dl_btn.get_attribute("href") or ""
+            if href.startswith("http"):
+                headers = {"User-Agent": d._user_agent, "Referer": d.current_url}
+                try:
+                    got = asyncio.run(_fetch_direct(href, worker_dir, headers, on_chunk=beat))
+                except Exception as e:
+                    log_status(global_idx, query, "direct download failed, using the browser", str(e))
+
+            if got is None:
+                # Click and follow the download it starts; drop events left over from earlier pages
+                d._cdp.drain()
+                # capture window handles to identify only new tabs spawned by this click
+                original = d.current_window_handle
+                before_handles = set(d.window_handles)
+                d.execute_script(_JS_CLICK_DOWNLOAD, dl_btn)
+                # Restore popup behavior and close stray tabs (only those newly opened)
+                try:
+                    d.execute_script("if (window._origOpen) window.open = window._origOpen;")
+                except Exception:
+                    pass
+                close_new_tabs(d, baseline_handles=before_handles, original_handle=original, grant_before_close=True)
 
-            # Wait for completion in worker folder
-            got = wait_for_download(new_after_ts=click_time, timeout=120, download_dir=worker_dir)
+                # Wait for completion in worker folder
+                beat()
+                got = wait_for_download(d, start_timeout=90, timeout=120, on_event=beat)
             if got:
-                target = DOWNLOADS / got.name
+                target = cfg.downloads / got.name
                 if target.exists():
                     stem, suf = target.stem, target.suffix
                     k = 1
                     while True:
-                        cand = DOWNLOADS / f"{stem} ({k}){suf}"
+                        cand = cfg.downloads / f"{stem} ({k}){suf}"
                         if not cand.exists():
                             target = cand
                             break
                         k += 1
+                # worker folders live inside DOWNLOADS, so this is a same-filesystem rename
                 try:
-                    shutil.move(str(got), str(target))
-                except Exception:
+                    try:
+                        os.rename(got, target)
+                    except OSError:
+                        os.link(got, target)
+                        os.unlink(got)
+                except OSError:
                     target = got
-                print(f"[{global_idx+1}] -> Downloaded: {target.name}")
+                log_status(global_idx, query, "downloaded", target.name)
             else:
-                print(f"[{global_idx+1}] -> Warning: No completed file detected")
+                log_status(global_idx, query, "no completed file detected")
+
+        while not stats.should_retire():
+            try:
+                global_idx, query = tasks.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                handle_query(global_idx, query)
+            except Exception as e:
+                log_status(global_idx, query, "error", str(e))
+            stats.finished_query(worker_id)
+
+            # recycle long-lived browsers before renderer memory creeps up, and
+            # replace any browser the controller shut down because it stalled
+            d._pages_processed += 1
+            with stats.lock:
+                killed = worker_id in stats.killed
+            if killed or d._pages_processed >= RECYCLE_AFTER:
+                if not killed:
+                    cleanup_driver(d)
+                d = None  # dead either way; if the relaunch fails there is nothing to pool
+                d = launch_worker_driver(worker_dir)
+                stats.attach(worker_id, d)
+                force_nav(d, cfg.site_url)
+                grant_notifications(d)
     finally:
-        cleanup_driver(d)
+        # only a live browser goes back for the next worker
+        if not stats.detach(worker_id) and d is not None:
+            _POOL.put(d)
+
+def control_concurrency(ex, cfg: WorkerConfig, tasks: "queue.Queue", stats: RunStats,
+                        futures: list, stop: threading.Event):
+    """Feedback loop on throughput: every MONITOR_INTERVAL seconds compare the
+    number of finished queries with the previous window. While throughput
+    strictly rises, add another worker (up to MAX_CONCURRENCY); flat or zero
+    throughput adds nothing; if throughput fell, retire one. Workers that
+    stall get their browser restarted."""
+    next_wid = len(futures)
+    active = len(futures)
+    last_completed = 0
+    prev_rate = None
+    last_change = 0  # +1 if we last added a worker, -1 if we retired one
+    while not stop.wait(MONITOR_INTERVAL):
+        with stats.lock:
+            completed = stats.completed
+        rate = completed - last_completed
+        last_completed = completed
+
+        for wid in stats.kill_stuck(time.time()):
+            print(f"Worker {wid+1} stalled; restarting its browser")
+
+        if prev_rate is not None and not tasks.empty():
+            if rate > prev_rate and rate > 0 and last_change >= 0 and active < MAX_CONCURRENCY:
+                futures.append(ex.submit(process_worker, cfg, next_wid, tasks, stats))
+                next_wid += 1
+                active += 1
+                last_change = 1
+            elif rate < prev_rate and active > 1:
+                with stats.lock:
+                    stats.retire += 1
+                active -= 1
+                last_change = -1
+            else:
+                last_change = 0
+        prev_rate = rate
 
 def run():
-    queries = list(read_queries())
+    # drop repeated rows, then anything a previous run already downloaded
+    queries = list(dict.fromkeys(read_queries()))
+    # match on the logged query, not the file name: the saved file is named
+    # after the title only, so two artists' songs of the same name share it
+    done = read_downloaded()
+    if done:
+        before = len(queries)
+        queries = [q for q in queries if q not in done]
+        if before != len(queries):
+            print(f"Skipping {before - len(queries)} queries already downloaded (see {OUTPUT_CSV})")
     if not queries:
         print("No queries to process.")
         return
-    print(f"Total queries: {len(queries)} | Concurrency: {CONCURRENCY}")
-    # Partition by modulo so worker k handles indices k, k+CONCURRENCY, ...
-    buckets: list[list[tuple[int, str]]] = [[] for _ in range(CONCURRENCY)]
-    for i, q in enumerate(queries):
-        buckets[i % CONCURRENCY].append((i, q))
-    with ThreadPoolExecutor(max_workers=CONCURRENCY) as ex:
-        futures = [ex.submit(process_worker, wid, tasks) for wid, tasks in enumerate(buckets) if tasks]
-        for fut in as_completed(futures):
-            try:
-                fut.result()
-            except Exception as e:
-                print(f"Worker error: {e}")
+    initial = min(CONCURRENCY, len(queries))
+    print(f"Total queries: {len(queries)} | Concurrency: {initial} (adaptive, max {MAX_CONCURRENCY})")
+    # One shared queue: whichever worker is free takes the next query, so a
+    # slow worker never holds back a fixed share of the list
+    tasks: "queue.Queue" = queue.Queue()
+    for item in enumerate(queries):
+        tasks.put(item)
+    cfg = WorkerConfig()
+    stats = RunStats()
+    stop = threading.Event()
+    logger = threading.Thread(target=log_writer, daemon=True)
+    logger.start()
+    fill_pool(initial)
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as ex:
+            futures = [ex.submit(process_worker, cfg, wid, tasks, stats) for wid in range(initial)]
+            controller = threading.Thread(target=control_concurrency,
+                                          args=(ex, cfg, tasks, stats, futures, stop), daemon=True)
+            controller.start()
+            reported = set()
+            while True:
+                pending = [f for f in futures if not f.done()]
+                for fut in futures:
+                    if fut.done() and fut not in reported:
+                        reported.add(fut)
+                        try:
+                            fut.result()
+                        except Exception as e:
+                            print(f"Worker error: {e}")
+                if not pending:
+                    break
+                wait(pending, timeout=MONITOR_INTERVAL, return_when=FIRST_COMPLETED)
+            stop.set()
+            controller.join()
+    finally:
+        drain_pool()
+        _LOG.put(None)
+        logger.join()
     print(f"Done. Files saved to: {DOWNLOADS}")
 
 if __name__ == "__main__":
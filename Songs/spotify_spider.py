@@ -20,12 +20,18 @@ Robustness:
 """
 
 import argparse
+import atexit
 import csv
 import os
+import pickle
+import random
 import re
+import threading
 import time
-from collections import OrderedDict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import chain, islice
 from typing import Dict, Iterable, List, Optional, Tuple
 
 from dotenv import load_dotenv
@@ -37,9 +43,22 @@ import spotipy
 from spotipy.oauth2 import SpotifyOAuth
 from spotipy.exceptions import SpotifyException, SpotifyOauthError
 import requests
+from requests.adapters import HTTPAdapter
 
 console = Console()
 SAFE_FN_RE = re.compile(r'[^\w\s\-\.\(\)&]')  # for filenames
+# same rule as SAFE_FN_RE for ASCII names, applied with str.translate
+_SANITIZE_TABLE = str.maketrans({chr(c): "_" for c in range(128) if SAFE_FN_RE.match(chr(c))})
+# "Made For You" playlist names (matched against playlists owned by 'spotify')
+MFY_RE = re.compile(r"^(?:Discover Weekly|Release Radar|Daily Mix \d+|On Repeat|Repeat Rewind|Your Top Songs \d{4})$",
+                    re.IGNORECASE)
+TRACK_FIELDS = ["track_id","track_name","artist_names","album_name","album_release_date","isrc","duration_ms","explicit","spotify_url"]
+MAX_WORKERS = 8  # parallel page fetches
+_API_SLOTS = threading.Semaphore(MAX_WORKERS)  # cap on in-flight Web API requests
+# after a 429, no thread sends anything before this time.monotonic() value
+_next_allowed_at = 0.0
+_RATE_LOCK = threading.Lock()
+_ensured_dirs: set = set()  # directories mkdirp already created in this process
 
 # ====== YOUR APP CREDS ======
 client_id = "" # Add here
@@ -52,29 +71,50 @@ def ts() -> str:
     return datetime.now().strftime("%Y%m%d-%H%M%S")
 
 def mkdirp(path: str):
+    if path in _ensured_dirs:
+        return
     os.makedirs(path, exist_ok=True)
+    _ensured_dirs.add(path)
 
 def sanitize(name: str) -> str:
     if not name:
         return "untitled"
-    cleaned = SAFE_FN_RE.sub("_", name)
+    cleaned = name.translate(_SANITIZE_TABLE) if name.isascii() else SAFE_FN_RE.sub("_", name)
     return cleaned.strip().strip("._") or "untitled"
 
-def write_csv(path: str, fieldnames: List[str], rows_iter: Iterable[dict]):
+class _Counted:
+    """Pass rows through to writerows while counting them."""
+    def __init__(self, rows_iter: Iterable):
+        self.rows = iter(rows_iter)
+        self.n = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row = next(self.rows)
+        self.n += 1
+        return row
+
+def write_csv(path: str, fieldnames: List[str], rows_iter: Iterable[dict]) -> int:
+    """Stream rows_iter into path; returns the number of rows written."""
     mkdirp(os.path.dirname(path))
-    with open(path, "w", newline="", encoding="utf-8") as f:
+    rows = _Counted(rows_iter)
+    with open(path, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
         w = csv.DictWriter(f, fieldnames=fieldnames)
         w.writeheader()
-        for r in rows_iter:
-            w.writerow(r)
+        w.writerows(rows)
+    return rows.n
 
-def write_csv_rows(path: str, header: List[str], rows_iter: Iterable[Iterable]):
+def write_csv_rows(path: str, header: List[str], rows_iter: Iterable[Iterable]) -> int:
+    """Like write_csv for rows that are already tuples in header order."""
     mkdirp(os.path.dirname(path))
-    with open(path, "w", newline="", encoding="utf-8") as f:
+    rows = _Counted(rows_iter)
+    with open(path, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
         w = csv.writer(f)
         w.writerow(header)
-        for row in rows_iter:
-            w.writerow(row)
+        w.writerows(rows)
+    return rows.n
 
 
 # ---------- exporter ----------
@@ -83,15 +123,26 @@ class ListsMaker:
     Builds the requested outputs with the corrected behavior.
     """
 
-    def __init__(self, outdir: str, artist_market: Optional[str] = None, cache_path=".cache-make-lists"):
+    def __init__(self, outdir: str, artist_market: Optional[str] = None, cache_path=".cache-make-lists",
+                 state_path: Optional[str] = ".lists_state.pkl", refresh: bool = False):
         load_dotenv()
         self.outdir = outdir
         self.artist_market = artist_market
         self.cache_path = cache_path
+        # harvest of the previous run; unchanged playlists and already-seen Liked
+        # tracks are taken from here instead of the API (--refresh ignores it)
+        self.state_path = state_path
+        self.prev = {} if refresh or not state_path else self._load_state(state_path)
 
         scope = "user-library-read playlist-read-private playlist-read-collaborative user-read-recently-played"
+        # one keep-alive pool for the whole harvest, sized for the parallel fetchers;
+        # retries stay in _retry, so the adapter itself never retries
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS, max_retries=0))
+        atexit.register(session.close)
         try:
             self.sp = spotipy.Spotify(
+                requests_session=session,
                 auth_manager=SpotifyOAuth(
                     scope=scope,
                     client_id=client_id,
@@ -111,12 +162,17 @@ class ListsMaker:
         self.user_id = self.user.get("id") if self.user else None
 
         # data stores
-        self.tracks: Dict[str, dict] = OrderedDict()   # track_id -> normalized track dict
-        self.albums: Dict[str, dict] = OrderedDict()   # album_id -> normalized album dict
-        self.playlists: Dict[str, dict] = OrderedDict()  # playlist_id -> dict
-        self.playlist_tracks: List[Tuple[str, str, str, Optional[str]]] = []  # (pid, tid, added_at, added_by)
-        self.saved_tracks: Dict[str, str] = OrderedDict()    # track_id -> added_at
+        self.tracks: Dict[str, dict] = {}   # track_id -> normalized track dict (_row_track, TRACK_FIELDS order)
+        self.albums: Dict[str, dict] = {}   # album_id -> normalized album dict
+        self.playlists: Dict[str, dict] = {}  # playlist_id -> dict
+        # playlist_id -> [(tid, added_at, added_by)], in playlist order
+        self.playlist_tracks_by_pid: Dict[str, List[Tuple[str, str, Optional[str]]]] = defaultdict(list)
+        self.saved_tracks: Dict[str, str] = {}    # track_id -> added_at
         self.track_to_album: Dict[str, str] = {}   # track_id -> album_id
+        self.owned_pids: frozenset = frozenset()   # playlist ids owned by the current user, set after harvest
+        self.liked_total = 0  # size of the Liked library as reported by /me/tracks
+
+        self._pool = ThreadPoolExecutor(max_workers=MAX_WORKERS)  # page fetches; results are merged on the caller's thread
 
     # ---------- terminal UI ----------
     def interactive(self):
@@ -135,72 +191,206 @@ class ListsMaker:
 
     # ---------- main pipeline ----------
     def run_all(self):
-        console.print("\n[bold]Step 1/5: Fetch Liked (Saved) tracks[/bold]")
-        self._harvest_liked()
+        try:
+            console.print("\n[bold]Step 1/5: Fetch Liked (Saved) tracks[/bold]")
+            self._harvest_liked()
 
-        console.print("[bold]Step 2/5: Fetch ALL playlists in your library[/bold]")
-        self._harvest_all_playlists()
+            console.print("[bold]Step 2/5: Fetch ALL playlists in your library[/bold]")
+            self._harvest_all_playlists()
+            self.owned_pids = frozenset(pid for pid, meta in self.playlists.items()
+                                        if meta.get("owner_id") == self.user_id)
 
-        console.print("[bold]Step 3/5: Fetch your recent plays (~50)[/bold]")
-        recent = self._fetch_recently_played()
+            console.print("[bold]Step 3/5: Fetch your recent plays (~50)[/bold]")
+            recent = self._fetch_recently_played()
 
-        console.print("[bold]Step 4/5: Write output files[/bold]")
-        outbase = os.path.join(self.outdir, f"lists_{ts()}")
-        mkdirp(outbase)
+            console.print("[bold]Step 4/5: Write output files[/bold]")
+            outbase = os.path.join(self.outdir, f"lists_{ts()}")
+            mkdirp(outbase)
 
-        # 1) Songs = ONLY Liked + playlists YOU OWN
-        self._write_my_songs(os.path.join(outbase, "1_my_songs.csv"))
+            # 1) Songs = ONLY Liked + playlists YOU OWN
+            self._write_my_songs(os.path.join(outbase, "1_my_songs.csv"))
 
-        # 3) Recent plays
-        self._write_recent(os.path.join(outbase, "3_recent_plays.csv"), recent)
+            # 3) Recent plays
+            self._write_recent(os.path.join(outbase, "3_recent_plays.csv"), recent)
 
-        # 4) Albums that contain your listened tracks
-        self._write_albums_listened(os.path.join(outbase, "4_albums_listened.csv"))
+            # 4) Albums that contain your listened tracks
+            self._write_albums_listened(os.path.join(outbase, "4_albums_listened.csv"))
 
-        # 5) One CSV per playlist you own
-        self._write_playlists_by_me(os.path.join(outbase, "5_playlists_by_me"))
+            # 5) One CSV per playlist you own
+            self._write_playlists_by_me(os.path.join(outbase, "5_playlists_by_me"))
 
-        # New) "Made For You" exports
-        self._write_made_for_you(os.path.join(outbase, "New"))
+            # New) "Made For You" exports
+            self._write_made_for_you(os.path.join(outbase, "New"))
+        except BaseException:
+            # don't let queued page fetches keep running (and retrying) after a failure
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            raise
 
+        self._pool.shutdown()
+        if self.state_path:
+            self._save_state(self.state_path)
         console.print(Panel.fit(f"[green]Done.[/green]\nOutput folder: [bold]{outbase}[/bold]"))
 
     # ---------- harvesting ----------
     def _harvest_liked(self):
-        limit, offset, total = 50, 0, 0
-        while True:
-            page = self._retry(lambda: self.sp.current_user_saved_tracks(limit=limit, offset=offset))
-            items = page.get("items", [])
-            if not items: break
-            for it in items:
+        limit, total = 50, 0
+        first = self._retry(lambda: self.sp.current_user_saved_tracks(limit=limit, offset=0))
+        self.liked_total = first.get("total") or 0
+        if self._harvest_liked_incremental(first, limit):
+            console.print(f"  • saved tracks: {len(self.saved_tracks)} (incremental)")
+            return
+        # page 0 carries the library size, so every other page can be requested at once
+        rest = [self._pool.submit(self._retry, lambda o=o: self.sp.current_user_saved_tracks(limit=limit, offset=o))
+                for o in range(limit, first.get("total") or 0, limit)]
+        # merged in offset order so saved_tracks keeps Spotify's newest-first order
+        for page in chain([first], (fut.result() for fut in rest)):
+            for it in page.get("items", []):
                 t = it.get("track")
                 if not t or t.get("type") != "track" or not t.get("id"):  # skip episodes/local/None
                     continue
                 self._add_track_full(t)
                 self.saved_tracks[t["id"]] = it.get("added_at")
                 total += 1
-            if len(items) < limit: break
-            offset += limit
         console.print(f"  • saved tracks: {total}")
 
+    def _harvest_liked_incremental(self, first: dict, limit: int) -> bool:
+        """Liked is newest-first: read pages only until the first track the last run
+        already had (same id and added_at), then reuse the rest of the old list.
+        Only trusted when the new items plus the old total add up to the current
+        total; otherwise returns False and the caller does a full fetch."""
+        prev_saved = self.prev.get("saved_tracks") or {}
+        prev_tracks = self.prev.get("tracks") or {}
+        if not prev_saved or not all(tid in prev_tracks for tid in prev_saved):
+            return False
+        new_items, hit, page, offset = [], False, first, 0
+        while page is not None:
+            for it in page.get("items", []):
+                t = it.get("track") or {}
+                if t.get("id") and prev_saved.get(t["id"]) == it.get("added_at"):
+                    hit = True
+                    break
+                new_items.append(it)
+            if hit or not page.get("next"):
+                break
+            offset += limit
+            page = self._retry(lambda o=offset: self.sp.current_user_saved_tracks(limit=limit, offset=o))
+        if not hit or len(new_items) + self.prev.get("liked_total", -1) != self.liked_total:
+            return False
+        for it in new_items:
+            t = it.get("track")
+            if not t or t.get("type") != "track" or not t.get("id"):
+                continue
+            self._add_track_full(t)
+            self.saved_tracks[t["id"]] = it.get("added_at")
+        for tid, added_at in prev_saved.items():
+            self._reuse_track(tid)
+            self.saved_tracks[tid] = added_at
+        return True
+
+    def _playlist_page(self, pid: str, offset: int):
+        return self._pool.submit(self._retry, lambda: self.sp.playlist_items(playlist_id=pid, offset=offset, limit=100))
+
+    def _iter_playlist_pages(self, pid: str, first: dict):
+        """Yield a playlist's pages in order, with at most MAX_WORKERS later pages
+        requested ahead; each raw page is dropped once the caller has merged it."""
+        offsets = iter(range(100, first.get("total") or 0, 100))
+        window = deque(self._playlist_page(pid, o) for o in islice(offsets, MAX_WORKERS))
+        yield first
+        del first
+        while window:
+            fut = window.popleft()
+            if (o := next(offsets, None)) is not None:
+                window.append(self._playlist_page(pid, o))
+            yield fut.result()
+
     def _harvest_all_playlists(self):
-        count_p = 0
-        for p in self._iter_pages(lambda **kw: self.sp.current_user_playlists(**kw), key="items", limit=50):
+        playlists = list(self._iter_pages(lambda **kw: self.sp.current_user_playlists(**kw), key="items", limit=50))
+        for p in playlists:
             self._add_playlist_basic(p)
+
+        # playlists whose snapshot_id hasn't changed since the last run keep their old track list
+        prev_playlists = self.prev.get("playlists") or {}
+        prev_entries = self.prev.get("playlist_tracks_by_pid") or {}
+        reused = {}
+        for p in playlists:
+            old = prev_playlists.get(p["id"]) or {}
+            entries = prev_entries.get(p["id"])
+            if (entries is not None and p.get("snapshot_id") and old.get("snapshot_id") == p["snapshot_id"]
+                    and all(self._reuse_track(tid) for tid, _, _ in entries)):
+                reused[p["id"]] = entries
+
+        # first pages run ahead of the merge by at most MAX_WORKERS playlists, so only
+        # a bounded number of raw pages is ever held; page 0's `total` gives the rest
+        todo = iter([p["id"] for p in playlists if p["id"] not in reused])
+        first_pages = {}
+
+        def prefetch():
+            while len(first_pages) < MAX_WORKERS and (pid := next(todo, None)) is not None:
+                first_pages[pid] = self._playlist_page(pid, 0)
+
+        count_p = 0
+        for p in playlists:
+            if p["id"] in reused:
+                self.playlist_tracks_by_pid[p["id"]] = list(reused[p["id"]])
+                count_p += 1
+                console.print(f"  • playlist '{p.get('name')}' → {len(reused[p['id']])} tracks (unchanged)")
+                continue
+            prefetch()
+            pages = self._iter_playlist_pages(p["id"], first_pages.pop(p["id"]).result())
+            prefetch()
             count = 0
-            for it in self._iter_pages(lambda **kw: self.sp.playlist_items(playlist_id=p["id"], **kw), key="items", limit=100):
+            for it in (it for page in pages for it in page.get("items", [])):
                 t = it.get("track")
                 if not t or t.get("type") != "track" or not t.get("id"):
                     continue
                 self._add_track_full(t)
-                self.playlist_tracks.append((
-                    p["id"], t["id"], it.get("added_at"), (it.get("added_by") or {}).get("id")
+                self.playlist_tracks_by_pid[p["id"]].append((
+                    t["id"], it.get("added_at"), (it.get("added_by") or {}).get("id")
                 ))
                 count += 1
             count_p += 1
             console.print(f"  • playlist '{p.get('name')}' → {count} tracks")
         console.print(f"  • total playlists processed: {count_p}")
 
+    # ---------- saved state ----------
+    def _load_state(self, path: str) -> dict:
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+            return {}
+
+    def _save_state(self, path: str):
+        state = {
+            "tracks": self.tracks,
+            "albums": self.albums,
+            "playlists": self.playlists,
+            "playlist_tracks_by_pid": dict(self.playlist_tracks_by_pid),
+            "saved_tracks": self.saved_tracks,
+            "track_to_album": self.track_to_album,
+            "liked_total": self.liked_total,
+        }
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(state, f, protocol=5)
+        os.replace(tmp, path)
+
+    def _reuse_track(self, tid: str) -> bool:
+        """Copy a track (and its album) harvested by the last run into this run's stores."""
+        if tid in self.tracks:
+            return True
+        row = (self.prev.get("tracks") or {}).get(tid)
+        if row is None:
+            return False
+        self.tracks[tid] = row
+        aid = (self.prev.get("track_to_album") or {}).get(tid)
+        if aid:
+            self.track_to_album[tid] = aid
+            album = (self.prev.get("albums") or {}).get(aid)
+            if album and aid not in self.albums:
+                self.albums[aid] = album
+        return True
+
     def _fetch_recently_played(self) -> List[dict]:
         try:
             rp = self._retry(lambda: self.sp.current_user_recently_played(limit=50))
@@ -216,97 +406,61 @@ class ListsMaker:
           - Saved (Liked) tracks
           - Tracks from playlists YOU OWN (owner_id == current user)
         """
-        # figure out which playlist IDs are owned by me
-        owned_pids = {pid for pid, meta in ((p["playlist_id"], p) for p in self.playlists.values())
-                      if meta.get("owner_id") == self.user_id}
-
         song_ids = set(self.saved_tracks.keys())
-        song_ids.update(tid for (pid, tid, _, _) in self.playlist_tracks if pid in owned_pids)
-
-        rows = []
-        for tid in sorted(song_ids):
-            t = self.tracks.get(tid)
-            if not t: 
-                continue
-            rows.append(self._row_track(t))
+        song_ids.update(tid for (tid, _, _) in chain.from_iterable(self.playlist_tracks_by_pid[pid] for pid in self.owned_pids))
 
-        write_csv(
-            path,
-            list(rows[0].keys()) if rows else
-            ["track_id","track_name","artist_names","album_name","album_release_date","isrc","duration_ms","explicit","spotify_url"],
-            rows
-        )
-        console.print(f"  • wrote {path} ({len(rows)} rows)")
+        n = write_csv_rows(path, TRACK_FIELDS,
+                           (tuple(t.values()) for tid, t in self.tracks.items() if tid in song_ids))
+        console.print(f"  • wrote {path} ({n} rows)")
 
     def _write_recent(self, path: str, recent_items: List[dict]):
-        rows = []
-        for it in recent_items:
-            t = it.get("track")
-            if not t or t.get("type") != "track" or not t.get("id"):
-                continue
-            rows.append({
-                "played_at": it.get("played_at"),
-                **self._row_track(self._ensure_track_full(t.get("id"), t))
-            })
-        write_csv(path,
-                  ["played_at","track_id","track_name","artist_names","album_name","album_release_date","isrc","duration_ms","explicit","spotify_url"],
-                  rows)
-        console.print(f"  • wrote {path} ({len(rows)} rows)")
+        played = [(it.get("played_at"), t) for it in recent_items
+                  if (t := it.get("track")) and t.get("type") == "track" and t.get("id")]
+        # one /v1/tracks call per 50 unknown tracks instead of one call each
+        self._ensure_tracks_full_bulk([t["id"] for _, t in played])
+        n = write_csv(path, ["played_at", *TRACK_FIELDS],
+                      ({"played_at": played_at, **(self.tracks.get(t["id"]) or self._row_track(t))}
+                       for played_at, t in played))
+        console.print(f"  • wrote {path} ({n} rows)")
 
     def _write_albums_listened(self, path: str):
         """Albums that contain any song from Liked + your OWN playlists."""
-        # owned playlist IDs
-        owned_pids = {pid for pid, meta in ((p["playlist_id"], p) for p in self.playlists.values())
-                      if meta.get("owner_id") == self.user_id}
-
         listened_tids = set(self.saved_tracks.keys())
-        listened_tids.update(tid for (pid, tid, _, _) in self.playlist_tracks if pid in owned_pids)
-
-        album_ids = set(self.track_to_album.get(tid) for tid in listened_tids if self.track_to_album.get(tid))
-        rows = []
-        for aid in sorted(album_ids):
-            a = self.albums.get(aid)
-            if not a: continue
-            rows.append({
-                "album_id": aid,
-                "album_name": a.get("name"),
-                "album_type": a.get("album_type"),
-                "total_tracks": a.get("total_tracks"),
-                "release_date": a.get("release_date"),
-                "release_date_precision": a.get("release_date_precision"),
-            })
-        write_csv(path,
-                  ["album_id","album_name","album_type","total_tracks","release_date","release_date_precision"],
-                  rows)
-        console.print(f"  • wrote {path} ({len(rows)} rows)")
+        listened_tids.update(tid for (tid, _, _) in chain.from_iterable(self.playlist_tracks_by_pid[pid] for pid in self.owned_pids))
+
+        album_ids = {aid for tid in listened_tids if (aid := self.track_to_album.get(tid))}
+        rows = ({
+            "album_id": aid,
+            "album_name": a.get("name"),
+            "album_type": a.get("album_type"),
+            "total_tracks": a.get("total_tracks"),
+            "release_date": a.get("release_date"),
+            "release_date_precision": a.get("release_date_precision"),
+        } for aid, a in self.albums.items() if aid in album_ids)
+        n = write_csv(path,
+                      ["album_id","album_name","album_type","total_tracks","release_date","release_date_precision"],
+                      rows)
+        console.print(f"  • wrote {path} ({n} rows)")
 
     def _write_playlists_by_me(self, dirpath: str):
-        """One CSV per playlist owned by me."""
-        mkdirp(dirpath)
+        """One CSV per non-empty playlist owned by me."""
         mine = [p for p in self.playlists.values() if (p.get("owner_id") == self.user_id)]
         index_rows = []
         for p in mine:
             pid = p["playlist_id"]
+            if not self.playlist_tracks_by_pid.get(pid):
+                continue  # no header-only files for empty playlists
             pname = p.get("name") or pid
             safe = sanitize(pname)
-            tracks_rows = []
-            for (ppid, tid, added_at, added_by) in self.playlist_tracks:
-                if ppid != pid: continue
-                t = self.tracks.get(tid)
-                if not t: continue
-                rec = self._row_track(t)
-                rec = {"added_at": added_at, **rec}
-                tracks_rows.append(rec)
             file_path = os.path.join(dirpath, f"{safe}.csv")
-            write_csv(file_path,
-                      ["added_at","track_id","track_name","artist_names","album_name","album_release_date","isrc","duration_ms","explicit","spotify_url"],
-                      tracks_rows)
+            write_csv_rows(file_path, ["added_at", *TRACK_FIELDS], self._playlist_rows(pid))
             index_rows.append([pname, file_path])
             console.print(f"  • wrote playlist file: {file_path}")
 
         # small index
-        write_csv_rows(os.path.join(dirpath, "_index.csv"),
-                       ["playlist_name","file_path"], index_rows)
+        if index_rows:
+            write_csv_rows(os.path.join(dirpath, "_index.csv"),
+                           ["playlist_name","file_path"], index_rows)
 
     def _write_made_for_you(self, dirpath: str):
         """
@@ -314,23 +468,13 @@ class ListsMaker:
         Heuristic: owner is 'spotify' and name matches known patterns.
         """
         mkdirp(dirpath)
-        patterns = [
-            r"^Discover Weekly$",
-            r"^Release Radar$",
-            r"^Daily Mix \d+$",
-            r"^On Repeat$",
-            r"^Repeat Rewind$",
-            r"^Your Top Songs \d{4}$",
-        ]
-        regexes = [re.compile(p, re.IGNORECASE) for p in patterns]
-
         mfys = []
         for p in self.playlists.values():
             owner_id = (p.get("owner_id") or "").lower()
             name = p.get("name") or ""
             if owner_id != "spotify":
                 continue
-            if any(rx.search(name) for rx in regexes):
+            if MFY_RE.match(name):
                 mfys.append(p)
 
         if not mfys:
@@ -341,25 +485,18 @@ class ListsMaker:
             pid = p["playlist_id"]
             pname = p.get("name") or pid
             safe = sanitize(pname)
-            rows = []
-            for (ppid, tid, added_at, added_by) in self.playlist_tracks:
-                if ppid != pid: 
-                    continue
-                t = self.tracks.get(tid)
-                if not t: 
-                    continue
-                rec = self._row_track(t)
-                rec = {"added_at": added_at, **rec}
-                rows.append(rec)
             out = os.path.join(dirpath, f"{safe}.csv")
-            write_csv(
-                out,
-                ["added_at","track_id","track_name","artist_names","album_name","album_release_date","isrc","duration_ms","explicit","spotify_url"],
-                rows
-            )
+            write_csv_rows(out, ["added_at", *TRACK_FIELDS], self._playlist_rows(pid))
             console.print(f"  • 'Made For You' → wrote {out}")
 
     # ---------- normalization ----------
+    def _playlist_rows(self, pid: str):
+        """Rows for one playlist's CSV, generated lazily in playlist order."""
+        for (tid, added_at, added_by) in self.playlist_tracks_by_pid.get(pid, []):
+            t = self.tracks.get(tid)
+            if t:
+                yield (added_at, *t.values())
+
     def _row_track(self, t: dict) -> dict:
         artists = ", ".join(a.get("name","") for a in (t.get("artists") or []))
         album = t.get("album") or {}
@@ -375,29 +512,31 @@ class ListsMaker:
             "spotify_url": (t.get("external_urls") or {}).get("spotify"),
         }
 
-    def _ensure_track_full(self, tid: str, fallback: Optional[dict] = None) -> dict:
-        if tid in self.tracks:
-            return self.tracks[tid]
-        try:
-            full = self._retry(lambda: self.sp.track(tid))
-            self._add_track_full(full)
-            return full
-        except Exception:
-            return fallback or {}
+    def _ensure_tracks_full_bulk(self, tids: List[str]):
+        """Fetch every track in tids we don't have yet, 50 ids per request."""
+        missing = list(dict.fromkeys(tid for tid in tids if tid not in self.tracks))
+        for i in range(0, len(missing), 50):
+            chunk = missing[i:i + 50]
+            try:
+                resp = self._retry(lambda c=chunk: self.sp.tracks(c))
+            except Exception:
+                continue  # callers fall back to the partial track objects they have
+            for full in resp.get("tracks") or []:
+                if full:
+                    self._add_track_full(full)
 
     def _add_track_full(self, t: dict):
         tid = t.get("id")
         if not tid: return
-        if tid not in self.tracks:
-            album = t.get("album") or {}
-            if album:
-                self._add_album_basic(album)
-            self.tracks[tid] = t
-            if album and album.get("id"):
-                self.track_to_album[tid] = album["id"]
-        # ensure album normalized
-        if t.get("album"):
-            self._add_album_basic(t["album"])
+        if tid in self.tracks:
+            return
+        album = t.get("album") or {}
+        if album:
+            self._add_album_basic(album)
+        # keep only the exported fields; the raw payload (available_markets etc.) is dropped
+        self.tracks[tid] = self._row_track(t)
+        if album.get("id"):
+            self.track_to_album[tid] = album["id"]
 
     def _add_album_basic(self, album: dict):
         aid = album.get("id")
@@ -427,36 +566,42 @@ class ListsMaker:
 
     # ---------- network helpers ----------
     def _retry(self, fn, *args, **kwargs):
+        global _next_allowed_at
         backoff = 1.0
         while True:
+            # a 429 seen by any thread holds back every thread, not just the one that got it
+            with _RATE_LOCK:
+                pause = _next_allowed_at - time.monotonic()
+            if pause > 0:
+                time.sleep(pause + random.uniform(0, 0.5))
             try:
-                return fn(*args, **kwargs)
+                with _API_SLOTS:
+                    return fn(*args, **kwargs)
             except SpotifyException as e:
                 if e.http_status == 429:
                     wait = float(e.headers.get("Retry-After", "2"))
-                    time.sleep(wait + 0.25)
+                    with _RATE_LOCK:
+                        _next_allowed_at = max(_next_allowed_at, time.monotonic() + wait + 0.25)
                     continue
                 # transient auth/network/server issues: backoff + retry
                 if e.http_status >= 500 or e.http_status in (401, 403, 408):
-                    time.sleep(backoff)
+                    time.sleep(backoff * (0.5 + random.random()))
                     backoff = min(backoff * 2, 16)
                     continue
                 raise
             except (requests.exceptions.RequestException, requests.exceptions.ConnectionError):
-                time.sleep(backoff)
+                time.sleep(backoff * (0.5 + random.random()))
                 backoff = min(backoff * 2, 16)
                 continue
 
     def _iter_pages(self, call, key: str, **kwargs):
         kwargs.setdefault("offset", 0)
         kwargs.setdefault("limit", 50)
-        while True:
-            page = self._retry(lambda: call(**kwargs))
-            items = page.get(key, [])
-            for it in items:
-                yield it
-            if not page.get("next"): break
-            kwargs["offset"] += kwargs["limit"]
+        page = self._retry(lambda: call(**kwargs))
+        while page:
+            yield from page.get(key, [])
+            # follow the server's cursor rather than re-deriving offset/limit
+            page = self._retry(lambda p=page: self.sp.next(p)) if page.get("next") else None
 
     def _env_hint(self):
         console.print(
@@ -474,6 +619,7 @@ def build_argparser():
     p.add_argument("--artist-market", default=None, help="(Unused here) Market/country code for artist catalogs")
     p.add_argument("--interactive", action="store_true", help="Guided prompts")
     p.add_argument("--fresh-auth", action="store_true", help="Delete .cache* before starting (fix stale tokens)")
+    p.add_argument("--refresh", action="store_true", help="Ignore the saved state from the last run and fetch everything")
     return p
 
 def main():
@@ -485,7 +631,7 @@ def main():
                 try: os.remove(f)
                 except Exception: pass
 
-    maker = ListsMaker(outdir=args.outdir, artist_market=args.artist_market)
+    maker = ListsMaker(outdir=args.outdir, artist_market=args.artist_market, refresh=args.refresh)
 
     if args.interactive:
         maker.interactive()